@@ -20,6 +20,8 @@ from .serializers import (
     EventStatsSerializer, PaymentStatsSerializer, SystemHealthSerializer,
     BulkActionSerializer, QuickActionSerializer, AdminMetricsSerializer
 )
+from apps.authentication.authentication import invalidate_user_tokens
+from apps.core import audit
 from apps.users.models import User
 from apps.events.models import Event, EventParticipation
 from apps.payments.models import Payment
@@ -336,11 +338,13 @@ def bulk_action(request):
                 updated_count = User.objects.filter(
                     id__in=target_ids
                 ).update(is_active=False)
+                invalidate_user_tokens(*target_ids)
             elif action == 'activate':
                 # Activer les utilisateurs
                 updated_count = User.objects.filter(
                     id__in=target_ids
                 ).update(is_active=True)
+                invalidate_user_tokens(*target_ids)
         
         elif target_type == 'event':
             if action == 'approve':
@@ -401,15 +405,25 @@ def quick_action(request):
         
         if action == 'approve_event':
             event = Event.objects.get(id=target_id)
+            statut_avant = event.statut
             event.statut = 'APPROUVE'
             event.save()
             result = f'Événement {event.titre} approuvé'
+            audit.record(
+                'APPROVE', request.user, event, result, request,
+                {'statut': statut_avant}, {'statut': event.statut}
+            )
         
         elif action == 'reject_event':
             event = Event.objects.get(id=target_id)
+            statut_avant = event.statut
             event.statut = 'REJETE'
             event.save()
             result = f'Événement {event.titre} rejeté'
+            audit.record(
+                'REJECT', request.user, event, result, request,
+                {'statut': statut_avant}, {'statut': event.statut}
+            )
         
         elif action == 'verify_user':
             user = User.objects.get(id=target_id)
@@ -418,9 +432,14 @@ def quick_action(request):
         
         elif action == 'suspend_user':
             user = User.objects.get(id=target_id)
+            actif_avant = user.is_active
             user.is_active = False
             user.save()
             result = f'Utilisateur {user.username} suspendu'
+            audit.record(
+                'UPDATE', request.user, user, result, request,
+                {'is_active': actif_avant}, {'is_active': user.is_active}
+            )
         
         # Enregistrer l'action administrative
         AdminAction.objects.create(
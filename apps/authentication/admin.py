@@ -23,6 +23,7 @@ class SocialAccountAdmin(admin.ModelAdmin):
     ]
     
     list_filter = ['provider', 'actif', 'date_creation']
+    list_select_related = ['utilisateur']
     search_fields = ['utilisateur__username', 'email', 'social_id']
     
     readonly_fields = [
@@ -68,6 +69,7 @@ class LoginAttemptAdmin(admin.ModelAdmin):
     ]
     
     list_filter = ['statut', 'date_tentative', 'pays']
+    list_select_related = ['utilisateur']
     search_fields = ['email_tente', 'adresse_ip', 'utilisateur__username']
     
     readonly_fields = [
@@ -95,6 +97,7 @@ class PasswordResetAdmin(admin.ModelAdmin):
     ]
     
     list_filter = ['statut', 'date_creation']
+    list_select_related = ['utilisateur']
     search_fields = ['utilisateur__username', 'token']
     
     readonly_fields = [
@@ -120,6 +123,7 @@ class EmailVerificationAdmin(admin.ModelAdmin):
     ]
     
     list_filter = ['type_verification', 'statut', 'date_creation']
+    list_select_related = ['utilisateur']
     search_fields = ['utilisateur__username', 'email', 'code']
     
     # Removed is_valid from readonly_fields
@@ -169,6 +173,7 @@ class TwoFactorAuthAdmin(admin.ModelAdmin):
     ]
     
     list_filter = ['actif', 'methode', 'date_activation']
+    list_select_related = ['utilisateur']
     search_fields = ['utilisateur__username']
     
     readonly_fields = [
@@ -185,7 +190,7 @@ class TwoFactorAuthAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         (_('Codes de récupération'), {
-            'fields': ('codes_recuperation', 'get_recovery_codes_count'),
+            'fields': ('get_recovery_codes_count',),
             'classes': ('collapse',)
         }),
         (_("Statistiques"), {
@@ -196,7 +201,7 @@ class TwoFactorAuthAdmin(admin.ModelAdmin):
     
     def get_recovery_codes_count(self, obj):
         """Affiche le nombre de codes de récupération restants."""
-        count = len(obj.codes_recuperation)
+        count = obj.recovery_codes_count
         if count > 5:
             color = 'green'
         elif count > 2:
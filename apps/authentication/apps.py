@@ -6,3 +6,7 @@ class AuthenticationConfig(AppConfig):
     name = 'apps.authentication'
     verbose_name = 'Authentication'
 
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .services import load_geoip_reader
+        load_geoip_reader()
@@ -0,0 +1,60 @@
+"""
+Classes d'authentification DRF pour SpotVibe.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from apps.core.utils import cache_delete_many, cache_get, cache_set
+
+# Durée de vie (en secondes) d'un token authentifié en cache : courte, pour
+# borner l'effet d'une invalidation manquée (désactivation hors signaux)
+TOKEN_CACHE_TIMEOUT = 300
+
+
+def token_cache_key(key):
+    """Clé de cache d'un token d'authentification."""
+    return f"authtok:{key}"
+
+
+def invalidate_user_tokens(*user_ids):
+    """
+    Invalide les tokens en cache des utilisateurs donnés (l'instance mise en cache est périmée).
+
+    À appeler après toute modification en masse (queryset.update) de comptes,
+    qui ne déclenche pas les signaux post_save.
+    """
+    keys = Token.objects.filter(user_id__in=user_ids).values_list('key', flat=True)
+    cache_delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Authentification par token avec mise en cache du couple (utilisateur, token).
+
+    Évite la requête authtoken_token JOIN users à chaque appel authentifié.
+    Le cache est invalidé par les signaux du token et de l'utilisateur
+    (voir signals.py) et par les désactivations en masse, qui appellent
+    invalidate_user_tokens ; une entrée dont l'utilisateur est inactif
+    n'est jamais servie.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        cached = cache_get(cache_key)
+        if cached is not None and cached[0].is_active:
+            return cached
+
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        cache_set(cache_key, (token.user, token), TOKEN_CACHE_TIMEOUT)
+        return (token.user, token)
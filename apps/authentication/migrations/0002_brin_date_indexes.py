@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2025-08-12 10:14
+
+from django.db import migrations, models
+
+
+# (table, nom de l'index, colonne) des index BRIN créés sous PostgreSQL uniquement.
+BRIN_INDEXES = [
+    ('authentication_loginattempt', 'login_attempt_date_brin', 'date_tentative'),
+    ('authentication_passwordreset', 'password_reset_created_brin', 'date_creation'),
+    ('authentication_emailverification', 'email_verify_created_brin', 'date_creation'),
+]
+
+
+def create_brin_indexes(apps, schema_editor):
+    """Crée les index BRIN sans verrouiller les tables (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, name, column in BRIN_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+            f'USING brin ("{column}") WITH (pages_per_range = 32)'
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    """Supprime les index BRIN (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for _table, name, _column in BRIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction.
+    atomic = False
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loginattempt',
+            name='date_tentative',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date et heure de la tentative', verbose_name='Date de tentative'),
+        ),
+        migrations.AlterField(
+            model_name='passwordreset',
+            name='date_creation',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date de création du token', verbose_name='Date de création'),
+        ),
+        migrations.AlterField(
+            model_name='emailverification',
+            name='date_creation',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date de création du code', verbose_name='Date de création'),
+        ),
+        # Hors de l'état des modèles : un index BRIN n'existe pas sous SQLite,
+        # qui le recréerait à chaque reconstruction de table.
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2025-08-12 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_brin_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='socialaccount',
+            name='social_account_active_expiry',
+        ),
+        migrations.AddIndex(
+            model_name='socialaccount',
+            index=models.Index(fields=['actif', 'token_expires_at'], include=['utilisateur', 'provider'], name='social_acct_active_expiry_cov'),
+        ),
+    ]
@@ -0,0 +1,130 @@
+# Generated by Django 5.2.4 on 2025-08-12 11:40
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# (modèle, champ) dont l'index simple est couvert par un index composite ou inutile.
+# Le token n'y figure pas : unique, son index db_index n'a jamais été créé.
+REDUNDANT_INDEXES = [
+    ('socialaccount', 'utilisateur'),
+    ('socialaccount', 'provider'),
+    ('socialaccount', 'actif'),
+    ('loginattempt', 'utilisateur'),
+    ('loginattempt', 'email_tente'),
+    ('loginattempt', 'statut'),
+    ('loginattempt', 'adresse_ip'),
+    ('passwordreset', 'utilisateur'),
+    ('passwordreset', 'date_expiration'),
+    ('emailverification', 'utilisateur'),
+    ('emailverification', 'date_expiration'),
+]
+
+
+def drop_redundant_indexes(apps, schema_editor):
+    """Supprime les index simples redondants sans verrouiller les tables (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, field_name in REDUNDANT_INDEXES:
+        model = apps.get_model('authentication', model_name)
+        column = model._meta.get_field(field_name).column
+        declared = {index.name for index in model._meta.indexes}
+        # Index sur la seule colonne (y compris l'index _like des champs texte)
+        for name in schema_editor._constraint_names(model, [column], index=True, unique=False):
+            if name not in declared:
+                schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def recreate_redundant_indexes(apps, schema_editor):
+    """Recrée les index simples supprimés (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, field_name in REDUNDANT_INDEXES:
+        model = apps.get_model('authentication', model_name)
+        for sql in schema_editor._field_indexes_sql(model, model._meta.get_field(field_name)):
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    # DROP INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction.
+    atomic = False
+
+    dependencies = [
+        ('authentication', '0003_social_account_covering_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Seul l'état change : sous PostgreSQL les index sont supprimés en
+        # CONCURRENTLY (AlterField verrouillerait la table, SQLite la reconstruirait).
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='socialaccount',
+                    name='utilisateur',
+                    field=models.ForeignKey(db_index=False, help_text='Utilisateur propriétaire du compte social', on_delete=django.db.models.deletion.CASCADE, related_name='social_accounts', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur'),
+                ),
+                migrations.AlterField(
+                    model_name='socialaccount',
+                    name='provider',
+                    field=models.CharField(choices=[('GOOGLE', 'Google'), ('FACEBOOK', 'Facebook')], help_text='Fournisseur du compte social', max_length=20, verbose_name='Fournisseur'),
+                ),
+                migrations.AlterField(
+                    model_name='socialaccount',
+                    name='actif',
+                    field=models.BooleanField(default=True, help_text='Compte social actif', verbose_name='Actif'),
+                ),
+                migrations.AlterField(
+                    model_name='loginattempt',
+                    name='utilisateur',
+                    field=models.ForeignKey(blank=True, db_index=False, help_text='Utilisateur concerné (si existant)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='login_attempts', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur'),
+                ),
+                migrations.AlterField(
+                    model_name='loginattempt',
+                    name='email_tente',
+                    field=models.EmailField(help_text='Email utilisé pour la tentative', max_length=254, validators=[django.core.validators.EmailValidator()], verbose_name='Email tenté'),
+                ),
+                migrations.AlterField(
+                    model_name='loginattempt',
+                    name='statut',
+                    field=models.CharField(choices=[('REUSSI', 'Réussi'), ('ECHEC', 'Échec'), ('BLOQUE', 'Bloqué')], help_text='Résultat de la tentative', max_length=10, verbose_name='Statut'),
+                ),
+                migrations.AlterField(
+                    model_name='loginattempt',
+                    name='adresse_ip',
+                    field=models.GenericIPAddressField(help_text='Adresse IP de la tentative', verbose_name='Adresse IP'),
+                ),
+                migrations.AlterField(
+                    model_name='passwordreset',
+                    name='utilisateur',
+                    field=models.ForeignKey(db_index=False, help_text='Utilisateur demandant la réinitialisation', on_delete=django.db.models.deletion.CASCADE, related_name='password_resets', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur'),
+                ),
+                migrations.AlterField(
+                    model_name='passwordreset',
+                    name='token',
+                    field=models.CharField(help_text='Token de réinitialisation', max_length=64, unique=True, verbose_name='Token'),
+                ),
+                migrations.AlterField(
+                    model_name='passwordreset',
+                    name='date_expiration',
+                    field=models.DateTimeField(help_text="Date d'expiration du token", verbose_name="Date d'expiration"),
+                ),
+                migrations.AlterField(
+                    model_name='emailverification',
+                    name='utilisateur',
+                    field=models.ForeignKey(db_index=False, help_text='Utilisateur concerné', on_delete=django.db.models.deletion.CASCADE, related_name='email_verifications', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur'),
+                ),
+                migrations.AlterField(
+                    model_name='emailverification',
+                    name='date_expiration',
+                    field=models.DateTimeField(help_text="Date d'expiration du code", verbose_name="Date d'expiration"),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_redundant_indexes, recreate_redundant_indexes),
+            ],
+        ),
+    ]
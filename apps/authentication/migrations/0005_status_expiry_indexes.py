@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2025-08-13 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_drop_redundant_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='passwordreset',
+            name='password_reset_expiry_status',
+        ),
+        migrations.AddIndex(
+            model_name='passwordreset',
+            index=models.Index(fields=['statut', 'date_expiration'], name='password_reset_status_expiry'),
+        ),
+        migrations.RemoveIndex(
+            model_name='emailverification',
+            name='email_verify_expiry_status',
+        ),
+        migrations.AddIndex(
+            model_name='emailverification',
+            index=models.Index(fields=['statut', 'date_expiration'], name='email_verify_status_expiry'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2025-08-13 09:20
+
+import hashlib
+
+from cryptography.fernet import Fernet, InvalidToken
+from django.conf import settings
+from django.db import migrations, models
+
+
+def hash_recovery_codes(apps, schema_editor):
+    """Remplace les codes de récupération chiffrés par leurs empreintes SHA-256."""
+    TwoFactorAuth = apps.get_model('authentication', 'TwoFactorAuth')
+    cipher_suite = Fernet(settings.SOCIAL_ACCOUNT_ENCRYPTION_KEY.encode())
+    for two_factor_auth in TwoFactorAuth.objects.exclude(codes_recuperation_encrypted=[]).iterator():
+        hashes = []
+        for code_encrypted in two_factor_auth.codes_recuperation_encrypted:
+            try:
+                code = cipher_suite.decrypt(code_encrypted.encode()).decode()
+            except InvalidToken:
+                continue
+            hashes.append(hashlib.sha256(code.encode()).hexdigest())
+        two_factor_auth.codes_recuperation_hashes = hashes
+        two_factor_auth.save(update_fields=['codes_recuperation_hashes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_status_expiry_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='twofactorauth',
+            name='codes_recuperation_hashes',
+            field=models.JSONField(blank=True, default=list, help_text='Liste des empreintes SHA-256 des codes de récupération', verbose_name='Empreintes des codes de récupération'),
+        ),
+        # Les empreintes ne permettent pas de retrouver les codes : pas de retour arrière des données.
+        migrations.RunPython(hash_recovery_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='twofactorauth',
+            name='codes_recuperation_encrypted',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2025-08-13 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_recovery_code_hashes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(condition=models.Q(('statut', 'ECHEC')), fields=['email_tente', 'date_tentative'], name='login_attempt_email_fail'),
+        ),
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(condition=models.Q(('statut', 'ECHEC')), fields=['adresse_ip', 'date_tentative'], name='login_attempt_ip_fail'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2025-08-13 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_login_attempt_failure_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(fields=['utilisateur', '-date_tentative'], include=('statut',), name='login_attempt_user_date'),
+        ),
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(condition=models.Q(('statut', 'REUSSI')), fields=['utilisateur', '-date_tentative'], name='login_attempt_user_success'),
+        ),
+    ]
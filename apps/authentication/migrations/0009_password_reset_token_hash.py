@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2025-08-13 14:02
+
+from django.db import migrations, models
+
+
+def expire_plaintext_tokens(apps, schema_editor):
+    """Expire les tokens actifs stockés en clair : ils ne correspondent à aucune empreinte."""
+    PasswordReset = apps.get_model('authentication', 'PasswordReset')
+    PasswordReset.objects.filter(statut='ACTIF').update(statut='EXPIRE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_login_attempt_user_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='passwordreset',
+            name='token',
+            field=models.CharField(help_text='Empreinte HMAC-SHA256 du token de réinitialisation', max_length=64, unique=True, verbose_name='Token'),
+        ),
+        migrations.RunPython(expire_plaintext_tokens, migrations.RunPython.noop),
+    ]
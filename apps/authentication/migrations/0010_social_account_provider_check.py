@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2025-08-13 14:20
+
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+def normalize_providers(apps, schema_editor):
+    """Met en majuscules les fournisseurs stockés avant d'ajouter la contrainte."""
+    SocialAccount = apps.get_model('authentication', 'SocialAccount')
+    SocialAccount.objects.exclude(provider__in=['GOOGLE', 'FACEBOOK']).update(provider=Upper('provider'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0009_password_reset_token_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_providers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='socialaccount',
+            constraint=models.CheckConstraint(
+                condition=models.Q(provider__in=['GOOGLE', 'FACEBOOK']),
+                name='social_account_provider_valid',
+            ),
+        ),
+    ]
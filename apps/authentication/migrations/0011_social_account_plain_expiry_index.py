@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2025-08-13 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0010_social_account_provider_check'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='socialaccount',
+            name='social_acct_active_expiry_cov',
+        ),
+        migrations.AddIndex(
+            model_name='socialaccount',
+            index=models.Index(fields=['actif', 'token_expires_at'], name='social_account_active_expiry'),
+        ),
+    ]
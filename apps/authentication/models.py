@@ -18,13 +18,16 @@ AMÉLIORATIONS APPORTÉES :
 - Nettoyage automatique des anciennes données pour la sécurité et la performance
 """
 
-from django.db import models
+from django.db import connection, models
+from django.db.models.functions import Cast
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from datetime import timedelta
+import base64
+import hashlib
+import hmac
 import secrets
-import string
 import json
 import logging
 from django.core.validators import MaxLengthValidator, EmailValidator
@@ -36,6 +39,8 @@ from django.conf import settings
 from cryptography.fernet import Fernet, InvalidToken
 from django.core.exceptions import ImproperlyConfigured
 
+from . import ratelimit
+
 try:
     cipher_suite = Fernet(settings.SOCIAL_ACCOUNT_ENCRYPTION_KEY.encode())
 except (AttributeError, ValueError) as e:
@@ -44,6 +49,49 @@ except (AttributeError, ValueError) as e:
         "Configurez SOCIAL_ACCOUNT_ENCRYPTION_KEY dans vos paramètres."
     ) from e
 
+# Longueur minimale d'un token Fernet encodé : 73 octets (version, horodatage,
+# IV, un bloc chiffré, HMAC) en base64 urlsafe, soit 100 caractères.
+FERNET_MIN_TOKEN_LENGTH = 100
+
+
+def decrypt_value(encrypted):
+    """
+    Déchiffre une valeur Fernet stockée en texte.
+
+    Retourne None sans appeler Fernet si la valeur est vide ou trop courte
+    pour être un token valide. Lève InvalidToken si le déchiffrement échoue.
+    """
+    if not encrypted or len(encrypted) < FERNET_MIN_TOKEN_LENGTH:
+        return None
+    return cipher_suite.decrypt(encrypted.encode()).decode()
+
+
+def decrypt_cached(instance, cache_attr, encrypted):
+    """
+    Déchiffre une valeur en mémorisant le résultat sur l'instance.
+
+    Le cache est associé à la valeur chiffrée : une modification directe du
+    champ ou un refresh_from_db() provoque un nouveau déchiffrement.
+    """
+    cached = instance.__dict__.get(cache_attr)
+    if cached is not None and cached[0] == encrypted:
+        return cached[1]
+    value = decrypt_value(encrypted)
+    instance.__dict__[cache_attr] = (encrypted, value)
+    return value
+
+
+class JSONBArrayRemove(models.Func):
+    """Retire un élément texte d'un tableau JSONB (opérateur PostgreSQL `-`)."""
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = models.JSONField()
+
+
+# Durées de validité lues une seule fois au chargement (politique fixée au déploiement)
+PASSWORD_RESET_VALIDITY = timedelta(hours=getattr(settings, "PASSWORD_RESET_VALIDITY_HOURS", 1))
+EMAIL_VERIFICATION_VALIDITY = timedelta(minutes=getattr(settings, "EMAIL_VERIFICATION_VALIDITY_MINUTES", 15))
+
 User = get_user_model()
 logger = logging.getLogger("spotvibe.authentication")
 
@@ -66,6 +114,7 @@ class SocialAccount(models.Model):
         ("GOOGLE", _("Google")),
         ("FACEBOOK", _("Facebook")),
     ]
+    _PROVIDER_VALUES = frozenset(value for value, _label in PROVIDER_CHOICES)
     
     utilisateur = models.ForeignKey(
         User,
@@ -73,15 +122,14 @@ class SocialAccount(models.Model):
         related_name="social_accounts",
         verbose_name=_("Utilisateur"),
         help_text="Utilisateur propriétaire du compte social",
-        db_index=True
+        db_index=False # Couvert par l'index social_account_user_provider
     )
     
     provider = models.CharField(
         _("Fournisseur"),
         max_length=20,
         choices=PROVIDER_CHOICES,
-        help_text="Fournisseur du compte social",
-        db_index=True
+        help_text="Fournisseur du compte social"
     )
     
     social_id = models.CharField(
@@ -157,8 +205,7 @@ class SocialAccount(models.Model):
     actif = models.BooleanField(
         _("Actif"),
         default=True,
-        help_text="Compte social actif",
-        db_index=True
+        help_text="Compte social actif"
     )
     
     class Meta:
@@ -170,6 +217,14 @@ class SocialAccount(models.Model):
             models.Index(fields=["utilisateur", "provider"], name="social_account_user_provider"),
             models.Index(fields=["actif", "token_expires_at"], name="social_account_active_expiry"),
         ]
+        constraints = [
+            # Fournisseur toujours stocké en majuscules : l'égalité stricte
+            # reste couverte par l'index social_account_user_provider
+            models.CheckConstraint(
+                condition=models.Q(provider__in=["GOOGLE", "FACEBOOK"]),
+                name="social_account_provider_valid",
+            ),
+        ]
     
     def __str__(self):
         """Représentation string du compte social."""
@@ -178,13 +233,11 @@ class SocialAccount(models.Model):
     @property
     def access_token(self):
         """Décrypte et retourne le token d'accès."""
-        if self.access_token_encrypted:
-            try:
-                return cipher_suite.decrypt(self.access_token_encrypted.encode()).decode()
-            except Exception as e:
-                logger.error(f"Erreur de décryptage du token d'accès pour SocialAccount {self.id}: {e}")
-                return None
-        return None
+        try:
+            return decrypt_cached(self, "_access_token_cache", self.access_token_encrypted)
+        except InvalidToken:
+            logger.error(f"Erreur de décryptage du token d'accès pour SocialAccount {self.id}")
+            return None
     
     @access_token.setter
     def access_token(self, value):
@@ -193,17 +246,16 @@ class SocialAccount(models.Model):
             self.access_token_encrypted = cipher_suite.encrypt(value.encode()).decode()
         else:
             self.access_token_encrypted = ""
+        self._access_token_cache = (self.access_token_encrypted, value or None)
 
     @property
     def refresh_token(self):
         """Décrypte et retourne le token de rafraîchissement."""
-        if self.refresh_token_encrypted:
-            try:
-                return cipher_suite.decrypt(self.refresh_token_encrypted.encode()).decode()
-            except Exception as e:
-                logger.error(f"Erreur de décryptage du token de rafraîchissement pour SocialAccount {self.id}: {e}")
-                return None
-        return None
+        try:
+            return decrypt_cached(self, "_refresh_token_cache", self.refresh_token_encrypted)
+        except InvalidToken:
+            logger.error(f"Erreur de décryptage du token de rafraîchissement pour SocialAccount {self.id}")
+            return None
     
     @refresh_token.setter
     def refresh_token(self, value):
@@ -212,17 +264,18 @@ class SocialAccount(models.Model):
             self.refresh_token_encrypted = cipher_suite.encrypt(value.encode()).decode()
         else:
             self.refresh_token_encrypted = ""
+        self._refresh_token_cache = (self.refresh_token_encrypted, value or None)
 
     def is_token_valid(self):
         """Vérifie si le token d'accès est encore valide."""
         if not self.token_expires_at:
             return True  # Pas d'expiration définie, considérer comme valide
         return timezone.now() < self.token_expires_at
-    
+
     def clean(self):
         """Validation personnalisée du modèle."""
         super().clean()
-        if self.provider not in [choice[0] for choice in self.PROVIDER_CHOICES]:
+        if self.provider not in self._PROVIDER_VALUES:
             raise ValidationError(_("Fournisseur de compte social invalide."))
 
     @classmethod
@@ -262,14 +315,13 @@ class LoginAttempt(models.Model):
         related_name="login_attempts",
         verbose_name=_("Utilisateur"),
         help_text="Utilisateur concerné (si existant)",
-        db_index=True
+        db_index=False # Couvert par l'index login_attempt_user_status
     )
     
     # Informations de tentative
     email_tente = models.EmailField(
         _("Email tenté"),
         help_text="Email utilisé pour la tentative",
-        db_index=True,
         validators=[EmailValidator()]
     )
     
@@ -277,8 +329,7 @@ class LoginAttempt(models.Model):
         _("Statut"),
         max_length=10,
         choices=STATUT_CHOICES,
-        help_text="Résultat de la tentative",
-        db_index=True
+        help_text="Résultat de la tentative"
     )
     
     raison_echec = models.CharField(
@@ -292,8 +343,7 @@ class LoginAttempt(models.Model):
     # Informations techniques
     adresse_ip = models.GenericIPAddressField(
         _("Adresse IP"),
-        help_text="Adresse IP de la tentative",
-        db_index=True
+        help_text="Adresse IP de la tentative"
     )
     
     user_agent = models.TextField(
@@ -324,8 +374,7 @@ class LoginAttempt(models.Model):
     date_tentative = models.DateTimeField(
         _("Date de tentative"),
         auto_now_add=True,
-        help_text="Date et heure de la tentative",
-        db_index=True
+        help_text="Date et heure de la tentative"
     )
     
     duree_session = models.DurationField(
@@ -343,8 +392,32 @@ class LoginAttempt(models.Model):
             models.Index(fields=["adresse_ip", "date_tentative"], name="login_attempt_ip_date"),
             models.Index(fields=["email_tente", "date_tentative"], name="login_attempt_email_date"),
             models.Index(fields=["utilisateur", "statut"], name="login_attempt_user_status"),
+            # Historique par utilisateur (auth_status_view) : parcours d'index seul grâce à INCLUDE
+            models.Index(
+                fields=["utilisateur", "-date_tentative"],
+                include=["statut"],
+                name="login_attempt_user_date",
+            ),
+            models.Index(
+                fields=["utilisateur", "-date_tentative"],
+                condition=models.Q(statut="REUSSI"),
+                name="login_attempt_user_success",
+            ),
             models.Index(fields=["statut", "date_tentative"], name="login_attempt_status_date"),
+            # Index partiels des échecs : comptage des échecs récents sans lecture de la table
+            models.Index(
+                fields=["email_tente", "date_tentative"],
+                condition=models.Q(statut="ECHEC"),
+                name="login_attempt_email_fail",
+            ),
+            models.Index(
+                fields=["adresse_ip", "date_tentative"],
+                condition=models.Q(statut="ECHEC"),
+                name="login_attempt_ip_fail",
+            ),
         ]
+        # Index BRIN login_attempt_date_brin sur date_tentative (colonne monotone,
+        # parcourue par plages) : créé par la migration 0002, PostgreSQL uniquement
     
     def __str__(self):
         """Représentation string de la tentative."""
@@ -352,7 +425,20 @@ class LoginAttempt(models.Model):
     
     @classmethod
     def get_recent_failures(cls, email, minutes=15):
-        """Retourne le nombre d'échecs récents pour un email."""
+        """
+        Retourne le nombre d'échecs récents pour un email.
+
+        Lit le compteur en cache pour la fenêtre suivie. Si le compteur est
+        absent du cache ou si le cache est indisponible, compte en base.
+        """
+        if minutes == ratelimit.EMAIL_FAILURE_WINDOW:
+            try:
+                failures = ratelimit.get_counter(ratelimit.email_failure_key(email))
+            except Exception as e:
+                failures = None
+                logger.warning(f"Compteur d'échecs indisponible pour {email}, repli sur la base: {e}")
+            if failures is not None:
+                return failures
         since = timezone.now() - timedelta(minutes=minutes)
         return cls.objects.filter(
             email_tente=email,
@@ -365,19 +451,35 @@ class LoginAttempt(models.Model):
         """
         Vérifie si une IP est bloquée en fonction du nombre de tentatives échouées.
         Peut être utilisé pour implémenter un blocage temporaire.
+
+        Lit le compteur en cache pour la fenêtre suivie. Si le compteur est
+        absent du cache ou si le cache est indisponible, compte en base.
         """
-        since = timezone.now() - timedelta(minutes=minutes)
-        failures = cls.objects.filter(
-            adresse_ip=ip_address,
-            statut="ECHEC",
-            date_tentative__gte=since
-        ).count()
+        failures = None
+        if minutes == ratelimit.IP_FAILURE_WINDOW:
+            try:
+                failures = ratelimit.get_counter(ratelimit.ip_failure_key(ip_address))
+            except Exception as e:
+                logger.warning(f"Compteur d'échecs indisponible pour l'IP {ip_address}, repli sur la base: {e}")
+        if failures is None:
+            since = timezone.now() - timedelta(minutes=minutes)
+            # Le comptage s'arrête dès que le seuil est atteint
+            failures = cls.objects.filter(
+                adresse_ip=ip_address,
+                statut="ECHEC",
+                date_tentative__gte=since
+            )[:max_attempts].count()
         
         if failures >= max_attempts:
             logger.warning(f"IP {ip_address} bloquée temporairement après {failures} tentatives échouées.")
             return True
         return False
     
+    @classmethod
+    def set_session_duration(cls, attempt_id, duree):
+        """Enregistre la durée de session en un seul UPDATE, sans recharger la ligne."""
+        return cls.objects.filter(pk=attempt_id).update(duree_session=duree)
+    
     @classmethod
     def cleanup_old_attempts(cls, days=90):
         """Nettoie les anciennes tentatives de connexion pour optimiser la base de données."""
@@ -396,6 +498,7 @@ class PasswordReset(models.Model):
     
     AMÉLIORATIONS :
     - Utilisation de secrets.SystemRandom pour une meilleure génération de tokens.
+    - Seule l'empreinte HMAC-SHA256 du token est stockée (recherche indexée).
     - Limitation du nombre de tentatives de réinitialisation par utilisateur/IP.
     - Nettoyage automatique des tokens expirés/utilisés.
     - Index sur les champs clés.
@@ -414,15 +517,15 @@ class PasswordReset(models.Model):
         related_name="password_resets",
         verbose_name=_("Utilisateur"),
         help_text="Utilisateur demandant la réinitialisation",
-        db_index=True
+        db_index=False # Couvert par l'index password_reset_user_status
     )
     
+    # Empreinte HMAC-SHA256 (hex) du token envoyé par email, jamais le token en clair
     token = models.CharField(
         _("Token"),
         max_length=64,
         unique=True,
-        help_text="Token de réinitialisation",
-        db_index=True
+        help_text="Empreinte HMAC-SHA256 du token de réinitialisation"
     )
     
     statut = models.CharField(
@@ -438,14 +541,12 @@ class PasswordReset(models.Model):
     date_creation = models.DateTimeField(
         _("Date de création"),
         auto_now_add=True,
-        help_text="Date de création du token",
-        db_index=True
+        help_text="Date de création du token"
     )
     
     date_expiration = models.DateTimeField(
         _("Date d'expiration"),
-        help_text="Date d'expiration du token",
-        db_index=True
+        help_text="Date d'expiration du token"
     )
     
     date_utilisation = models.DateTimeField(
@@ -474,31 +575,72 @@ class PasswordReset(models.Model):
         ordering = ["-date_creation"]
         indexes = [
             models.Index(fields=["utilisateur", "statut"], name="password_reset_user_status"),
-            models.Index(fields=["date_expiration", "statut"], name="password_reset_expiry_status"),
+            # Égalité sur statut puis plage sur date_expiration (is_valid, nettoyage)
+            models.Index(fields=["statut", "date_expiration"], name="password_reset_status_expiry"),
         ]
+        # Index BRIN password_reset_created_brin : migration 0002, PostgreSQL uniquement
     
     def __str__(self):
         """Représentation string de la réinitialisation."""
         return f"{self.utilisateur.username} - {self.statut}"
     
     def save(self, *args, **kwargs):
-        """Sauvegarde avec génération automatique du token et de l'expiration."""
+        """
+        Sauvegarde avec génération automatique du token et de l'expiration.
+
+        Le token en clair généré reste disponible dans `raw_token` pour l'envoi.
+        """
         if not self.token:
-            self.token = self.generate_token()
+            self.raw_token = self.generate_token()
+            self.token = self.hash_token(self.raw_token)
         
         if not self.date_expiration:
             # Token valide 1 heure par défaut, configurable via settings
-            from django.conf import settings
-            validity_hours = getattr(settings, 'PASSWORD_RESET_VALIDITY_HOURS', 1)
-            self.date_expiration = timezone.now() + timedelta(hours=validity_hours)
+            self.date_expiration = timezone.now() + PASSWORD_RESET_VALIDITY
         
         super().save(*args, **kwargs)
     
     @staticmethod
     def generate_token():
         """Génère un token sécurisé et cryptographiquement fort."""
-        alphabet = string.ascii_letters + string.digits + "-_"
-        return ".".join(secrets.token_urlsafe(32) for _ in range(2)) # Génère un token plus long et plus sûr
+        return secrets.token_urlsafe(48) # 384 bits, soit exactement 64 caractères
+
+    @staticmethod
+    def hash_token(token):
+        """Retourne l'empreinte HMAC-SHA256 (clé SECRET_KEY) d'un token en clair."""
+        return hmac.new(settings.SECRET_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+    def rotate_token(self):
+        """
+        Remplace le token par un nouveau et retourne sa valeur en clair.
+
+        Appelé par la tâche d'envoi : le token en clair n'est jamais transmis
+        au broker. Retourne None si la demande n'est plus active.
+        """
+        raw_token = self.generate_token()
+        token = self.hash_token(raw_token)
+        rotated = type(self).objects.filter(
+            pk=self.pk, statut="ACTIF", date_expiration__gt=timezone.now()
+        ).update(token=token)
+        if not rotated:
+            return None
+        self.token = token
+        self.raw_token = raw_token
+        return raw_token
+
+    @classmethod
+    def get_active(cls, token):
+        """
+        Retourne la réinitialisation active correspondant au token en clair.
+
+        Recherche par égalité sur l'empreinte (index unique). Lève DoesNotExist
+        si le token est inconnu, utilisé ou expiré.
+        """
+        return cls.objects.get(
+            token=cls.hash_token(token),
+            statut="ACTIF",
+            date_expiration__gt=timezone.now()
+        )
     
     def is_valid(self):
         """Vérifie si le token est valide."""
@@ -508,22 +650,30 @@ class PasswordReset(models.Model):
         )
     
     def use_token(self, ip_address):
-        """Marque le token comme utilisé."""
-        if not self.is_valid():
+        """
+        Marque le token comme utilisé.
+
+        Un seul UPDATE conditionnel : un token ne peut être consommé qu'une fois,
+        même en cas de requêtes concurrentes.
+        """
+        now = timezone.now()
+        updated = type(self).objects.filter(
+            pk=self.pk, statut="ACTIF", date_expiration__gt=now
+        ).update(statut="UTILISE", date_utilisation=now, adresse_ip_utilisation=ip_address)
+        if not updated:
             logger.warning(f"Tentative d'utilisation d'un token de réinitialisation invalide: {self.token}")
             return False
         
         self.statut = "UTILISE"
-        self.date_utilisation = timezone.now()
+        self.date_utilisation = now
         self.adresse_ip_utilisation = ip_address
-        self.save()
-        logger.info(f"Token de réinitialisation {self.token} utilisé par {self.utilisateur.username} depuis {ip_address}")
+        logger.info(f"Token de réinitialisation {self.token} utilisé par l'utilisateur {self.utilisateur_id} depuis {ip_address}")
         return True
     
     def expire_token(self):
         """Marque le token comme expiré."""
         self.statut = "EXPIRE"
-        self.save()
+        type(self).objects.filter(pk=self.pk).update(statut="EXPIRE")
         logger.info(f"Token de réinitialisation {self.token} expiré manuellement.")
 
     @classmethod
@@ -572,7 +722,7 @@ class EmailVerification(models.Model):
         related_name="email_verifications",
         verbose_name=_("Utilisateur"),
         help_text="Utilisateur concerné",
-        db_index=True
+        db_index=False # Couvert par l'index email_verify_user_email_status
     )
     
     email = models.EmailField(
@@ -610,14 +760,12 @@ class EmailVerification(models.Model):
     date_creation = models.DateTimeField(
         _("Date de création"),
         auto_now_add=True,
-        help_text="Date de création du code",
-        db_index=True
+        help_text="Date de création du code"
     )
     
     date_expiration = models.DateTimeField(
         _("Date d'expiration"),
-        help_text="Date d'expiration du code",
-        db_index=True
+        help_text="Date d'expiration du code"
     )
     
     date_verification = models.DateTimeField(
@@ -654,8 +802,9 @@ class EmailVerification(models.Model):
         indexes = [
             models.Index(fields=["utilisateur", "email", "statut"], name="email_verify_user_email_status"),
             models.Index(fields=["code", "statut"], name="email_verification_code_status"),
-            models.Index(fields=["date_expiration", "statut"], name="email_verify_expiry_status"),
+            models.Index(fields=["statut", "date_expiration"], name="email_verify_status_expiry"),
         ]
+        # Index BRIN email_verify_created_brin : migration 0002, PostgreSQL uniquement
     
     def __str__(self):
         """Représentation string de la vérification."""
@@ -668,16 +817,14 @@ class EmailVerification(models.Model):
         
         if not self.date_expiration:
             # Code valide 15 minutes par défaut, configurable via settings
-            from django.conf import settings
-            validity_minutes = getattr(settings, 'EMAIL_VERIFICATION_VALIDITY_MINUTES', 15)
-            self.date_expiration = timezone.now() + timedelta(minutes=validity_minutes)
+            self.date_expiration = timezone.now() + EMAIL_VERIFICATION_VALIDITY
         
         super().save(*args, **kwargs)
     
     @staticmethod
     def generate_code():
         """Génère un code de vérification à 6 chiffres cryptographiquement fort."""
-        return ''.join(secrets.SystemRandom().choice(string.digits) for _ in range(6))
+        return f"{secrets.randbelow(1_000_000):06d}"
     
     def is_valid(self):
         """Vérifie si le code est valide et non bloqué."""
@@ -688,41 +835,48 @@ class EmailVerification(models.Model):
         )
     
     def verify_code(self, code_input):
-        """Vérifie le code saisi."""
-        self.tentatives += 1
-        
-        if not self.is_valid():
-            self.save(update_fields=["tentatives"]) # Sauvegarder la tentative même si invalide
+        """
+        Vérifie le code saisi.
+
+        La tentative est comptée par un UPDATE atomique conditionnel, qui échoue
+        si le code n'est plus valide (statut, expiration ou tentatives épuisées).
+        """
+        now = timezone.now()
+        rows = type(self).objects.filter(pk=self.pk)
+        counted = rows.filter(
+            statut="EN_ATTENTE",
+            date_expiration__gt=now,
+            tentatives__lt=models.F("max_tentatives"),
+        ).update(tentatives=models.F("tentatives") + 1)
+        if not counted:
             logger.warning(f"Tentative de vérification d'email invalide pour {self.email}. Statut: {self.statut}, Tentatives: {self.tentatives}")
             return False
+        self.tentatives += 1
         
-        if self.code == code_input:
+        if hmac.compare_digest(self.code, code_input or ""):
+            if not rows.filter(statut="EN_ATTENTE").update(statut="VERIFIE", date_verification=now):
+                return False
             self.statut = "VERIFIE"
-            self.date_verification = timezone.now()
-            self.save(update_fields=["statut", "date_verification", "tentatives"])
-            logger.info(f"Email {self.email} vérifié avec succès pour {self.utilisateur.username}.")
+            self.date_verification = now
+            logger.info(f"Email {self.email} vérifié avec succès pour l'utilisateur {self.utilisateur_id}.")
             return True
-        else:
-            # Marquer comme bloqué si trop de tentatives
-            if self.tentatives >= self.max_tentatives:
-                self.statut = "BLOQUE"
-                logger.warning(f"Vérification d'email pour {self.email} bloquée après trop de tentatives échouées.")
-            self.save(update_fields=["statut", "tentatives"])
-            return False
+        
+        # Marquer comme bloqué si trop de tentatives (d'après la valeur en base)
+        if rows.filter(statut="EN_ATTENTE", tentatives__gte=models.F("max_tentatives")).update(statut="BLOQUE"):
+            self.statut = "BLOQUE"
+            logger.warning(f"Vérification d'email pour {self.email} bloquée après trop de tentatives échouées.")
+        return False
     
     def resend_code(self):
         """Génère un nouveau code pour renvoyer, si le statut le permet."""
         if self.statut in ["EN_ATTENTE", "EXPIRE", "BLOQUE"]:
             self.code = self.generate_code()
             self.date_creation = timezone.now()
-            
-            from django.conf import settings
-            validity_minutes = getattr(settings, 'EMAIL_VERIFICATION_VALIDITY_MINUTES', 15)
-            self.date_expiration = timezone.now() + timedelta(minutes=validity_minutes)
+            self.date_expiration = self.date_creation + EMAIL_VERIFICATION_VALIDITY
             
             self.statut = "EN_ATTENTE"
             self.tentatives = 0
-            self.save()
+            self.save(update_fields=["code", "date_creation", "date_expiration", "statut", "tentatives"])
             logger.info(f"Nouveau code de vérification envoyé pour {self.email}.")
             return True
         logger.warning(f"Impossible de renvoyer le code pour {self.email}. Statut actuel: {self.statut}")
@@ -749,7 +903,7 @@ class TwoFactorAuth(models.Model):
     
     AMÉLIORATIONS :
     - Stockage sécurisé de la clé secrète (chiffrée).
-    - Gestion des codes de récupération.
+    - Codes de récupération stockés sous forme d'empreintes SHA-256.
     - Index sur les champs clés.
     """
     
@@ -758,6 +912,7 @@ class TwoFactorAuth(models.Model):
         ("EMAIL", _("Email")),
         ("TOTP", _("Application d'authentification")), # Google Authenticator, Authy
     ]
+    _METHODE_VALUES = frozenset(value for value, _label in METHODE_CHOICES)
     
     utilisateur = models.OneToOneField(
         User,
@@ -791,12 +946,12 @@ class TwoFactorAuth(models.Model):
         help_text="Clé secrète chiffrée pour TOTP"
     )
     
-    # Codes de récupération (JSONField pour stocker une liste de codes chiffrés)
-    codes_recuperation_encrypted = models.JSONField(
-        _("Codes de récupération chiffrés"),
+    # Codes de récupération (JSONField pour stocker les empreintes SHA-256 des codes)
+    codes_recuperation_hashes = models.JSONField(
+        _("Empreintes des codes de récupération"),
         default=list,
         blank=True,
-        help_text="Liste de codes de récupération chiffrés"
+        help_text="Liste des empreintes SHA-256 des codes de récupération"
     )
     
     date_activation = models.DateTimeField(
@@ -825,13 +980,11 @@ class TwoFactorAuth(models.Model):
     @property
     def secret_key(self):
         """Décrypte et retourne la clé secrète TOTP."""
-        if self.secret_key_encrypted:
-            try:
-                return cipher_suite.decrypt(self.secret_key_encrypted.encode()).decode()
-            except Exception as e:
-                logger.error(f"Erreur de décryptage de la clé secrète 2FA pour {self.utilisateur.username}: {e}")
-                return None
-        return None
+        try:
+            return decrypt_cached(self, "_secret_key_cache", self.secret_key_encrypted)
+        except InvalidToken:
+            logger.error(f"Erreur de décryptage de la clé secrète 2FA pour l'utilisateur {self.utilisateur_id}")
+            return None
     
     @secret_key.setter
     def secret_key(self, value):
@@ -840,62 +993,83 @@ class TwoFactorAuth(models.Model):
             self.secret_key_encrypted = cipher_suite.encrypt(value.encode()).decode()
         else:
             self.secret_key_encrypted = ""
+        self._secret_key_cache = (self.secret_key_encrypted, value or None)
 
     @property
-    def codes_recuperation(self):
-        """Décrypte et retourne les codes de récupération."""
-        decrypted_codes = []
-        for code_encrypted in self.codes_recuperation_encrypted:
-            try:
-                decrypted_codes.append(cipher_suite.decrypt(code_encrypted.encode()).decode())
-            except Exception as e:
-                logger.error(f"Erreur de décryptage d'un code de récupération pour {self.utilisateur.username}: {e}")
-        return decrypted_codes
-    
-    @codes_recuperation.setter
-    def codes_recuperation(self, value):
-        """Chiffre et stocke les codes de récupération."""
-        encrypted_codes = []
-        for code in value:
-            encrypted_codes.append(cipher_suite.encrypt(code.encode()).decode())
-        self.codes_recuperation_encrypted = encrypted_codes
+    def recovery_codes_count(self):
+        """Nombre de codes de récupération restants."""
+        return len(self.codes_recuperation_hashes)
+
+    @staticmethod
+    def hash_recovery_code(code):
+        """Retourne l'empreinte SHA-256 d'un code de récupération."""
+        return hashlib.sha256(code.encode()).hexdigest()
 
     def activate(self):
         """Active la 2FA pour l'utilisateur."""
         self.actif = True
         self.date_activation = timezone.now()
         self.date_desactivation = None
-        self.save()
+        self.save(update_fields=["actif", "date_activation", "date_desactivation"])
         logger.info(f"2FA activée pour {self.utilisateur.username}.")
 
     def deactivate(self):
         """Désactive la 2FA pour l'utilisateur."""
         self.actif = False
         self.date_desactivation = timezone.now()
-        self.save()
+        self.save(update_fields=["actif", "date_desactivation"])
         logger.info(f"2FA désactivée pour {self.utilisateur.username}.")
 
+    @staticmethod
+    def _build_recovery_codes(count=5):
+        """Génère `count` codes de récupération en clair."""
+        # Un seul tirage aléatoire encodé en base32 (A-Z, 2-7), découpé en codes de 10 caractères
+        code_length = 10
+        raw = secrets.token_bytes((count * code_length * 5 + 7) // 8)
+        encoded = base64.b32encode(raw).decode().rstrip("=")
+        return [encoded[i * code_length:(i + 1) * code_length] for i in range(count)]
+
+    def set_recovery_codes(self, codes):
+        """Remplace les codes de récupération (empreintes uniquement), sans sauvegarder."""
+        self.codes_recuperation_hashes = [self.hash_recovery_code(c) for c in codes]
+
     def generate_recovery_codes(self, count=5):
-        """Génère de nouveaux codes de récupération."""
-        new_codes = []
-        for _ in range(count):
-            new_codes.append(''.join(secrets.SystemRandom().choice(string.ascii_uppercase + string.digits) for _ in range(10)))
-        self.codes_recuperation = new_codes # Utilise le setter qui chiffre
-        self.save()
-        logger.info(f"{count} codes de récupération générés pour {self.utilisateur.username}.")
+        """
+        Génère de nouveaux codes de récupération et retourne les codes en clair.
+
+        L'instance n'est pas sauvegardée : l'appelant enregistre une seule fois,
+        par exemple avec save(update_fields=["codes_recuperation_hashes"]).
+        """
+        new_codes = self._build_recovery_codes(count)
+        # Seules les empreintes sont conservées : les codes en clair ne sont retournés qu'une fois
+        self.set_recovery_codes(new_codes)
+        logger.info(f"{count} codes de récupération générés pour l'utilisateur {self.utilisateur_id}.")
         return new_codes
 
     def use_recovery_code(self, code):
         """Marque un code de récupération comme utilisé."""
-        current_codes = self.codes_recuperation # Utilise le getter qui décrypte
-        if code in current_codes:
-            current_codes.remove(code)
-            self.codes_recuperation = current_codes # Utilise le setter qui chiffre
-            self.save()
-            logger.info(f"Code de récupération utilisé par {self.utilisateur.username}.")
-            return True
-        logger.warning(f"Tentative d'utilisation d'un code de récupération invalide pour {self.utilisateur.username}.")
-        return False
+        code_hash = self.hash_recovery_code(code or "")
+        if code_hash not in self.codes_recuperation_hashes:
+            logger.warning(f"Tentative d'utilisation d'un code de récupération invalide pour l'utilisateur {self.utilisateur_id}.")
+            return False
+
+        rows = TwoFactorAuth.objects.filter(pk=self.pk)
+        if connection.vendor == "postgresql":
+            # Retrait atomique de l'empreinte en une seule requête (opérateur jsonb `-`)
+            used = rows.filter(codes_recuperation_hashes__contains=[code_hash]).update(
+                codes_recuperation_hashes=JSONBArrayRemove(
+                    models.F("codes_recuperation_hashes"), Cast(models.Value(code_hash), models.TextField())
+                )
+            )
+            if not used:
+                logger.warning(f"Code de récupération déjà utilisé pour l'utilisateur {self.utilisateur_id}.")
+                return False
+            self.codes_recuperation_hashes = [h for h in self.codes_recuperation_hashes if h != code_hash]
+        else:
+            self.codes_recuperation_hashes = [h for h in self.codes_recuperation_hashes if h != code_hash]
+            rows.update(codes_recuperation_hashes=self.codes_recuperation_hashes)
+        logger.info(f"Code de récupération utilisé par l'utilisateur {self.utilisateur_id}.")
+        return True
 
     def clean(self):
         """Validation personnalisée du modèle."""
@@ -903,7 +1077,7 @@ class TwoFactorAuth(models.Model):
         if self.actif and not self.secret_key_encrypted and self.methode == "TOTP":
             raise ValidationError(_("La clé secrète est requise pour l'authentification TOTP."))
         
-        if self.methode not in [choice[0] for choice in self.METHODE_CHOICES]:
+        if self.methode not in self._METHODE_VALUES:
             raise ValidationError(_("Méthode 2FA invalide."))
 
 
@@ -0,0 +1,60 @@
+"""
+Compteurs d'échecs de connexion pour l'application authentication.
+
+Les échecs sont comptés dans le cache Django (Redis en production) avec
+INCR + expiration, ce qui évite un COUNT SQL sur LoginAttempt lorsque le
+compteur existe. La fenêtre démarre au premier échec et expire après sa durée.
+"""
+
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Fenêtres suivies par les compteurs (en minutes)
+EMAIL_FAILURE_WINDOW = 15
+IP_FAILURE_WINDOW = 60
+
+
+def email_failure_key(email):
+    """Clé du compteur d'échecs pour un email."""
+    return f"login_fail:{EMAIL_FAILURE_WINDOW}:{email.lower()}"
+
+
+def ip_failure_key(ip_address):
+    """Clé du compteur d'échecs pour une adresse IP."""
+    return f"login_fail_ip:{IP_FAILURE_WINDOW}:{ip_address}"
+
+
+def increment_counter(key, window_minutes):
+    """Incrémente un compteur expirant après `window_minutes` et retourne sa valeur."""
+    cache.add(key, 0, timeout=window_minutes * 60)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # La clé a expiré entre add() et incr()
+        cache.set(key, 1, timeout=window_minutes * 60)
+        return 1
+
+
+def get_counter(key):
+    """
+    Retourne la valeur d'un compteur, ou None s'il est absent du cache.
+
+    Une absence ne signifie pas zéro échec (cache vidé, éviction, cache
+    local à un autre processus) : l'appelant recompte alors en base.
+    """
+    return cache.get(key)
+
+
+def register_login_failure(email, ip_address):
+    """Comptabilise un échec de connexion pour l'email et l'adresse IP."""
+    try:
+        if email:
+            increment_counter(email_failure_key(email), EMAIL_FAILURE_WINDOW)
+        if ip_address:
+            increment_counter(ip_failure_key(ip_address), IP_FAILURE_WINDOW)
+    except Exception as e:
+        logger.warning(f"Compteurs d'échecs de connexion indisponibles: {e}")
+
@@ -8,15 +8,157 @@ l'authentification avancée et les connexions sociales.
 from rest_framework import serializers
 from django.contrib.auth import authenticate, get_user_model
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from .models import SocialAccount, LoginAttempt
+from .services import active_user_exists
 from apps.users.serializers import UserPublicSerializer
+import re
+import secrets
+import time
 import facebook
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 from django.conf import settings
 
 User = get_user_model()
 
+# Formats validés par les sérialiseurs 2FA (compilés une seule fois) ; le
+# téléphone suit le validateur du modèle User, où il est enregistré
+PHONE_NUMBER_RE = User.phone_regex.regex
+VERIFICATION_CODE_RE = re.compile(r'[0-9]{6}')
+
+
+def _build_http_session():
+    """Session HTTP partagée (keep-alive, pool de connexions, nouvelles tentatives)."""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=50,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    ))
+    return session
+
+
+GOOGLE_CERTS_URL = 'https://www.googleapis.com/oauth2/v1/certs'
+GOOGLE_CERTS_CACHE_TIMEOUT = 3600
+
+
+class CachedCertsRequest(google_requests.Request):
+    """
+    Transport google-auth gardant en mémoire les certificats publics de Google.
+
+    verify_oauth2_token() télécharge les certificats à chaque appel : ils
+    sont ici conservés GOOGLE_CERTS_CACHE_TIMEOUT secondes par processus, la
+    vérification du token ne fait alors plus aucun appel réseau.
+    """
+
+    def __init__(self, session=None):
+        super().__init__(session=session)
+        self._certs = None
+
+    def __call__(self, url, method='GET', body=None, headers=None, timeout=None, **kwargs):
+        if method != 'GET' or url != GOOGLE_CERTS_URL:
+            return super().__call__(url, method, body, headers, timeout, **kwargs)
+        if self._certs is not None and self._certs[0] > time.monotonic():
+            return self._certs[1]
+        response = super().__call__(url, method, body, headers, timeout, **kwargs)
+        if response.status == 200:
+            self._certs = (time.monotonic() + GOOGLE_CERTS_CACHE_TIMEOUT, response)
+        return response
+
+
+# Connexions réutilisées entre les requêtes vers Google et Facebook
+http_session = _build_http_session()
+google_request = CachedCertsRequest(session=http_session)
+
+
+# Tentatives de création d'un utilisateur social avant d'abandonner
+USER_CREATION_ATTEMPTS = 3
+
+
+def generate_unique_username(base):
+    """
+    Retourne un nom d'utilisateur libre dérivé de `base`.
+
+    Une seule requête récupère les noms déjà pris ; le premier suffixe libre
+    est ensuite cherché en mémoire.
+    """
+    taken = set(
+        User.objects.filter(username__startswith=base).values_list('username', flat=True)
+    )
+    counter = 1
+    username = base
+    while username in taken:
+        username = f"{base}{counter}"
+        counter += 1
+    return username
+
+
+def generate_placeholder_phone():
+    """
+    Retourne un téléphone temporaire valide (+22900XXXXXXXX) pour un compte social.
+
+    Le champ est unique et obligatoire : le suffixe aléatoire évite les
+    collisions entre comptes, le préfixe 00 n'est attribué à aucun abonné.
+    """
+    return f"+22900{secrets.randbelow(10 ** 8):08d}"
+
+
+def create_user_with_unique_username(base, **extra_fields):
+    """
+    Crée un utilisateur avec un nom dérivé de `base` (et un téléphone temporaire).
+
+    Le nom ou le téléphone peuvent être pris par un autre processus entre la
+    recherche et l'insertion : quelle que soit la contrainte violée, la
+    création est retentée avec un nouveau nom et un nouveau téléphone.
+    """
+    for attempt in range(USER_CREATION_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(
+                    username=generate_unique_username(base),
+                    telephone=generate_placeholder_phone(),
+                    **extra_fields
+                )
+        except IntegrityError:
+            if attempt == USER_CREATION_ATTEMPTS - 1:
+                raise
+
+
+def get_or_create_social_user(provider, social_id, account_fields, username_base, **user_fields):
+    """
+    Retourne l'utilisateur lié au compte social, en le créant si nécessaire.
+
+    Un compte existant est lu en une requête (jointure sur l'utilisateur).
+    Sinon, l'utilisateur et le compte social sont créés dans une même
+    transaction. Si une connexion concurrente a inséré le compte entre-temps
+    (contrainte unique provider/social_id), l'utilisateur créé ici est
+    annulé et celui du compte existant est retourné.
+    """
+    social_account = (
+        SocialAccount.objects.select_related('utilisateur')
+        .filter(provider=provider, social_id=social_id)
+        .first()
+    )
+    if social_account is not None:
+        return social_account.utilisateur
+
+    with transaction.atomic():
+        user = create_user_with_unique_username(username_base, **user_fields)
+        social_account, created = SocialAccount.objects.select_related('utilisateur').get_or_create(
+            provider=provider,
+            social_id=social_id,
+            defaults={'utilisateur': user, **account_fields},
+        )
+        if not created:
+            # Course perdue : l'utilisateur créé ici n'est rattaché à aucun compte
+            transaction.set_rollback(True)
+            return social_account.utilisateur
+    return user
+
 
 class SocialAccountSerializer(serializers.ModelSerializer):
     """
@@ -46,27 +188,23 @@ class GoogleAuthSerializer(serializers.Serializer):
         try:
             idinfo = id_token.verify_oauth2_token(
                 value,
-                google_requests.Request(),
+                google_request,
                 settings.SPOTVIBE_SETTINGS['GOOGLE_OAUTH2_CLIENT_ID']
             )
 
             if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
                 raise serializers.ValidationError("Token émis par un fournisseur non autorisé")
 
+            # Conservé pour create() : évite une seconde vérification auprès de Google
+            self._idinfo = idinfo
             return value
         except Exception as e:
             raise serializers.ValidationError(f"Token Google invalide: {str(e)}")
     
     def create(self, validated_data):
         """Crée ou récupère un utilisateur via Google."""
-        token = validated_data['access_token']
-        
-        # Récupérer les infos utilisateur depuis Google
-        idinfo = id_token.verify_oauth2_token(
-            token,
-            google_requests.Request(),
-            settings.SPOTVIBE_SETTINGS['GOOGLE_OAUTH2_CLIENT_ID']
-        )
+        # Infos utilisateur décodées lors de la validation du token
+        idinfo = self._idinfo
         
         google_user_data = {
             'id': idinfo['sub'],
@@ -75,43 +213,24 @@ class GoogleAuthSerializer(serializers.Serializer):
             'picture': idinfo.get('picture', '')
         }
         
-        # Chercher ou créer le compte social
-        social_account, created = SocialAccount.objects.get_or_create(
-            provider='GOOGLE',
-            social_id=google_user_data['id'],
-            defaults={
+        first_name, _, last_name = google_user_data['name'].strip().partition(' ')
+        last_name = last_name.strip()
+        
+        # Chercher ou créer le compte social et l'utilisateur
+        return get_or_create_social_user(
+            'GOOGLE',
+            google_user_data['id'],
+            {
                 'email': google_user_data['email'],
                 'nom_complet': google_user_data['name'],
                 'photo_url': google_user_data['picture']
-            }
+            },
+            google_user_data['email'].partition('@')[0],
+            email=google_user_data['email'],
+            first_name=first_name,
+            last_name=last_name,
         )
 
-        # Chercher ou créer l'utilisateur
-        if social_account.utilisateur:
-            user = social_account.utilisateur
-        else:
-            # Créer un nouvel utilisateur
-            username = google_user_data['email'].split('@')[0]
-            # S'assurer que le username est unique
-            counter = 1
-            original_username = username
-            while User.objects.filter(username=username).exists():
-                username = f"{original_username}{counter}"
-                counter += 1
-            
-            user = User.objects.create_user(
-                username=username,
-                email=google_user_data['email'],
-                first_name=google_user_data['name'].split()[0],
-                last_name=' '.join(google_user_data['name'].split()[1:]),
-                telephone=f"+229{counter:10d}"  # Téléphone temporaire
-            )
-            
-            social_account.utilisateur = user
-            social_account.save()
-        
-        return user
-
 
 class FacebookAuthSerializer(serializers.Serializer):
     """Sérialiseur pour l'authentification Facebook."""
@@ -121,59 +240,39 @@ class FacebookAuthSerializer(serializers.Serializer):
     def validate_access_token(self, value):
         """Valide le token d'accès Facebook."""
         try:
-            graph = facebook.GraphAPI(access_token=value, version='3.1')
-            # Vérifie si le token est valide en récupérant les infos utilisateur
-            user_info = graph.get_object('me', fields='id,email,name,picture')
+            graph = facebook.GraphAPI(access_token=value, version='3.1', session=http_session)
+            # Vérifie si le token est valide en récupérant les infos utilisateur,
+            # conservées pour create() afin d'éviter un second appel à l'API Graph
+            self._user_info = graph.get_object(
+                'me',
+                fields='id,email,name,picture.type(large)'
+            )
             return value
         except Exception as e:
             raise serializers.ValidationError(f"Token Facebook invalide: {str(e)}")
     
     def create(self, validated_data):
         """Crée ou récupère un utilisateur via Facebook."""
-        token = validated_data['access_token']
+        # Infos utilisateur récupérées lors de la validation du token
+        facebook_user_data = self._user_info
         
-        # Récupérer les infos utilisateur depuis Facebook
-        graph = facebook.GraphAPI(access_token=token, version='3.1')
-        facebook_user_data = graph.get_object(
-            'me',
-            fields='id,email,name,picture.type(large)'
-        )
+        first_name, _, last_name = facebook_user_data['name'].strip().partition(' ')
+        last_name = last_name.strip()
         
-        # Chercher ou créer le compte social
-        social_account, created = SocialAccount.objects.get_or_create(
-            provider='FACEBOOK',
-            social_id=facebook_user_data['id'],
-            defaults={
+        # Chercher ou créer le compte social et l'utilisateur
+        return get_or_create_social_user(
+            'FACEBOOK',
+            facebook_user_data['id'],
+            {
                 'email': facebook_user_data.get('email', ''),
                 'nom_complet': facebook_user_data.get('name', ''),
                 'photo_url': facebook_user_data.get('picture', {}).get('data', {}).get('url', '')
-            }
+            },
+            facebook_user_data['email'].partition('@')[0],
+            email=facebook_user_data['email'],
+            first_name=first_name,
+            last_name=last_name,
         )
-        
-        # Chercher ou créer l'utilisateur
-        if social_account.utilisateur:
-            user = social_account.utilisateur
-        else:
-            # Créer un nouvel utilisateur
-            username = facebook_user_data['email'].split('@')[0]
-            counter = 1
-            original_username = username
-            while User.objects.filter(username=username).exists():
-                username = f"{original_username}{counter}"
-                counter += 1
-            
-            user = User.objects.create_user(
-                username=username,
-                email=facebook_user_data['email'],
-                first_name=facebook_user_data['name'].split()[0],
-                last_name=' '.join(facebook_user_data['name'].split()[1:]),
-                telephone=f"+229{counter:10d}"
-            )
-            
-            social_account.utilisateur = user
-            social_account.save()
-        
-        return user
 
 
 class LoginAttemptSerializer(serializers.ModelSerializer):
@@ -187,7 +286,7 @@ class LoginAttemptSerializer(serializers.ModelSerializer):
         model = LoginAttempt
         fields = [
             'id', 'utilisateur', 'adresse_ip', 'user_agent',
-            'reussi', 'date_tentative', 'raison_echec'
+            'statut', 'date_tentative', 'raison_echec'
         ]
         read_only_fields = ['id', 'date_tentative']
 
@@ -201,14 +300,8 @@ class TwoFactorSetupSerializer(serializers.Serializer):
     
     def validate_phone_number(self, value):
         """Valide le numéro de téléphone."""
-        if not value.startswith('+229'):
-            raise serializers.ValidationError(
-                "Le numéro doit commencer par +229"
-            )
-        if len(value) != 15:
-            raise serializers.ValidationError(
-                "Le numéro doit contenir 15 caractères (+229XXXXXXXX)"
-            )
+        if not PHONE_NUMBER_RE.fullmatch(value):
+            raise serializers.ValidationError(User.phone_regex.message)
         return value
 
 
@@ -221,7 +314,7 @@ class TwoFactorVerifySerializer(serializers.Serializer):
     
     def validate_code(self, value):
         """Valide le code 2FA."""
-        if not value.isdigit():
+        if not VERIFICATION_CODE_RE.fullmatch(value):
             raise serializers.ValidationError(
                 "Le code doit contenir uniquement des chiffres"
             )
@@ -237,9 +330,7 @@ class PasswordResetRequestSerializer(serializers.Serializer):
     
     def validate_email(self, value):
         """Valide que l'email existe."""
-        try:
-            User.objects.get(email=value, is_active=True)
-        except User.DoesNotExist:
+        if not active_user_exists(value):
             raise serializers.ValidationError(
                 "Aucun compte actif trouvé avec cette adresse email"
             )
@@ -0,0 +1,122 @@
+"""
+Services pour l'application authentication.
+
+Ce module contient l'enregistrement différé des tentatives de connexion :
+les tentatives sont mises en tampon puis insérées par lots, hors du
+chemin critique des requêtes d'authentification. Il contient aussi le
+cache d'existence des comptes actifs utilisé par la réinitialisation
+de mot de passe, et la géolocalisation des adresses IP (base MaxMind
+GeoLite2 ouverte en mmap, consultée au moment de l'insertion groupée).
+"""
+
+import atexit
+import hashlib
+import logging
+
+import maxminddb
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from apps.core.buffers import BulkInsertBuffer
+from apps.core.utils import cache_delete, cache_get, cache_set
+from .models import LoginAttempt
+from .ratelimit import register_login_failure
+
+logger = logging.getLogger(__name__)
+
+# Lecteur de la base GeoLite2 City, ouvert une fois par processus (voir AuthenticationConfig.ready)
+_geoip_reader = None
+
+
+def load_geoip_reader():
+    """
+    Ouvre la base GeoLite2 City en mode mmap.
+
+    Sans GEOIP_CITY_DATABASE configuré (ou si le fichier est illisible), la
+    géolocalisation est simplement désactivée.
+    """
+    global _geoip_reader
+    path = getattr(settings, "GEOIP_CITY_DATABASE", "")
+    if _geoip_reader is not None or not path:
+        return _geoip_reader
+    try:
+        _geoip_reader = maxminddb.open_database(path, maxminddb.MODE_MMAP)
+    except (OSError, maxminddb.InvalidDatabaseError) as e:
+        logger.warning(f"Base de géolocalisation indisponible ({path}): {e}")
+    return _geoip_reader
+
+
+def geolocate_ip(ip_address):
+    """Retourne (code pays ISO, ville) pour une IP, ou ("", "") si inconnue."""
+    if _geoip_reader is None or not ip_address:
+        return "", ""
+    try:
+        record = _geoip_reader.get(ip_address) or {}
+    except ValueError:
+        return "", ""
+    country = record.get("country", {}).get("iso_code", "")
+    city = record.get("city", {}).get("names", {}).get("en", "")
+    return country, city[:100]
+
+
+# Durée de vie (en secondes) du cache d'existence des comptes actifs
+ACTIVE_USER_CACHE_TIMEOUT = 60
+
+
+def _active_user_cache_key(email):
+    """Clé de cache d'existence d'un compte actif (l'email n'apparaît pas en clair)."""
+    digest = hashlib.sha256(email.encode()).hexdigest()
+    return f"user_exists_active:{digest}"
+
+
+def active_user_exists(email):
+    """
+    Indique si un compte actif existe pour cet email.
+
+    Le résultat est mis en cache pendant ACTIVE_USER_CACHE_TIMEOUT secondes
+    pour éviter une requête SQL à chaque demande de réinitialisation.
+    """
+    key = _active_user_cache_key(email)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached == '1'
+
+    exists = get_user_model().objects.filter(email=email, is_active=True).exists()
+    cache_set(key, '1' if exists else '0', ACTIVE_USER_CACHE_TIMEOUT)
+    return exists
+
+
+def invalidate_active_user(email):
+    """Supprime l'entrée de cache d'existence d'un compte."""
+    if not email:
+        return
+    cache_delete(_active_user_cache_key(email))
+
+
+class LoginAttemptBuffer(BulkInsertBuffer):
+    """
+    Tampon en mémoire des tentatives de connexion.
+
+    Les compteurs d'échecs en cache sont mis à jour immédiatement ; le pays
+    et la ville sont renseignés au moment de l'insertion groupée.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(LoginAttempt, **kwargs)
+
+    def put(self, attempt):
+        """Ajoute une tentative (instance LoginAttempt non sauvegardée) au tampon."""
+        if attempt.statut == "ECHEC":
+            # Les compteurs en cache sont mis à jour immédiatement, l'audit en base est différé
+            register_login_failure(attempt.email_tente, attempt.adresse_ip)
+        super().put(attempt)
+
+    def prepare_batch(self, batch):
+        """Géolocalise les tentatives du lot."""
+        for attempt in batch:
+            if not attempt.pays and not attempt.ville:
+                attempt.pays, attempt.ville = geolocate_ip(attempt.adresse_ip)
+
+
+login_attempt_buffer = LoginAttemptBuffer()
+atexit.register(login_attempt_buffer.flush)
@@ -0,0 +1,33 @@
+"""
+Signaux pour l'application authentication.
+"""
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from apps.core.utils import cache_delete
+from .authentication import invalidate_user_tokens, token_cache_key
+from .services import invalidate_active_user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_active_user_cache(sender, instance, **kwargs):
+    """Invalide le cache d'existence du compte (désactivation, changement d'email, suppression)."""
+    invalidate_active_user(instance.email)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_token_cache(sender, instance, created, **kwargs):
+    """Invalide les tokens en cache de l'utilisateur (l'instance mise en cache est périmée)."""
+    if not created:
+        invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache(sender, instance, **kwargs):
+    """Invalide le token en cache après modification ou suppression."""
+    cache_delete(token_cache_key(instance.key))
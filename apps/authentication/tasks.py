@@ -0,0 +1,113 @@
+"""
+Tâches asynchrones pour l'application authentication.
+
+Les envois d'emails et de SMS sont exécutés par les workers Celery
+pour ne pas bloquer les requêtes HTTP.
+"""
+
+import logging
+from smtplib import SMTPServerDisconnected
+
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import get_connection, send_mail
+
+from .models import PasswordReset
+
+logger = logging.getLogger(__name__)
+
+# Email de réinitialisation (gabarit défini une fois, rempli par format_map)
+PASSWORD_RESET_SUBJECT = 'Réinitialisation de votre mot de passe SpotVibe'
+PASSWORD_RESET_MESSAGE = """Bonjour {first_name},
+
+Vous avez demandé la réinitialisation de votre mot de passe.
+
+Cliquez sur le lien suivant pour réinitialiser votre mot de passe :
+{reset_url}
+
+Ce lien expire dans 1 heure.
+
+Si vous n'avez pas demandé cette réinitialisation, ignorez cet email.
+
+L'équipe SpotVibe
+"""
+
+# Connexion SMTP ouverte une fois et réutilisée par les tâches d'un même worker
+_mail_connection = None
+
+
+def get_mail_connection():
+    """Retourne la connexion email du worker, ouverte au premier usage."""
+    global _mail_connection
+    if _mail_connection is None:
+        _mail_connection = get_connection()
+        _mail_connection.open()
+    return _mail_connection
+
+
+def reset_mail_connection():
+    """Ferme la connexion email du worker (elle sera rouverte au prochain envoi)."""
+    global _mail_connection
+    if _mail_connection is not None:
+        try:
+            _mail_connection.close()
+        except Exception:
+            pass
+        _mail_connection = None
+
+
+def send_worker_mail(**kwargs):
+    """Envoie un email sur la connexion du worker, en la rouvrant une fois si le serveur l'a fermée."""
+    try:
+        return send_mail(connection=get_mail_connection(), **kwargs)
+    except SMTPServerDisconnected:
+        reset_mail_connection()
+        return send_mail(connection=get_mail_connection(), **kwargs)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_password_reset_email(self, password_reset_id):
+    """
+    Envoie l'email de réinitialisation de mot de passe.
+
+    Le token en clair est généré ici (seule son empreinte est stockée) :
+    la file de messages ne transporte que l'identifiant de la demande.
+    """
+    try:
+        password_reset = PasswordReset.objects.select_related('utilisateur').only(
+            'utilisateur', 'utilisateur__first_name', 'utilisateur__email'
+        ).get(pk=password_reset_id)
+    except PasswordReset.DoesNotExist:
+        logger.warning(f"Réinitialisation de mot de passe : demande {password_reset_id} introuvable.")
+        return
+
+    reset_token = password_reset.rotate_token()
+    if reset_token is None:
+        logger.warning(f"Réinitialisation de mot de passe : demande {password_reset_id} utilisée ou expirée.")
+        return
+
+    user = password_reset.utilisateur
+    reset_url = f"{settings.FRONTEND_URL}/reset-password/{reset_token}"
+
+    try:
+        send_worker_mail(
+            subject=PASSWORD_RESET_SUBJECT,
+            message=PASSWORD_RESET_MESSAGE.format_map({
+                'first_name': user.first_name,
+                'reset_url': reset_url,
+            }),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[user.email],
+            fail_silently=False,
+        )
+    except Exception as exc:
+        logger.error(f"Erreur lors de l'envoi de l'email de réinitialisation à l'utilisateur {user.pk}: {exc}")
+        reset_mail_connection()
+        raise self.retry(exc=exc)
+
+
+@shared_task
+def send_2fa_sms(phone_number, verification_code):
+    """Envoie le code de vérification 2FA par SMS."""
+    # Simulation : en production, intégrez un service SMS comme Twilio
+    logger.info(f'Code 2FA pour {phone_number}: {verification_code}')
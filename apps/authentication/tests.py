@@ -1,3 +1,380 @@
-from django.test import TestCase
+"""
+Tests de l'application authentication.
+"""
 
-# Create your tests here.
+import hashlib
+from datetime import timedelta
+from unittest import mock
+
+from cryptography.fernet import Fernet
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from . import ratelimit
+from .models import EmailVerification, LoginAttempt, PasswordReset, TwoFactorAuth
+from .tasks import send_password_reset_email
+from .views import two_factor_setup_key
+
+User = get_user_model()
+
+
+def create_user(username="alice", telephone="+2290100000001"):
+    """Crée un utilisateur de test (le téléphone est unique)."""
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="MotDePasse1",
+        telephone=telephone,
+    )
+
+
+def other_code(code):
+    """Retourne un code à 6 chiffres différent de `code`."""
+    return "111111" if code != "111111" else "222222"
+
+
+class EmailVerificationVerifyCodeTests(TestCase):
+    """Vérification d'un code d'email par UPDATE conditionnels."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.verification = EmailVerification.objects.create(
+            utilisateur=self.user,
+            email=self.user.email,
+            max_tentatives=3,
+        )
+
+    def test_valid_code(self):
+        self.assertTrue(self.verification.verify_code(self.verification.code))
+
+        self.verification.refresh_from_db()
+        self.assertEqual(self.verification.statut, "VERIFIE")
+        self.assertEqual(self.verification.tentatives, 1)
+        self.assertIsNotNone(self.verification.date_verification)
+
+    def test_wrong_code(self):
+        self.assertFalse(self.verification.verify_code(other_code(self.verification.code)))
+
+        self.verification.refresh_from_db()
+        self.assertEqual(self.verification.statut, "EN_ATTENTE")
+        self.assertEqual(self.verification.tentatives, 1)
+
+    def test_exhausted_attempts(self):
+        wrong = other_code(self.verification.code)
+        for _attempt in range(self.verification.max_tentatives):
+            self.assertFalse(self.verification.verify_code(wrong))
+
+        self.verification.refresh_from_db()
+        self.assertEqual(self.verification.statut, "BLOQUE")
+        # Le bon code est refusé une fois les tentatives épuisées
+        self.assertFalse(self.verification.verify_code(self.verification.code))
+        self.verification.refresh_from_db()
+        self.assertEqual(self.verification.tentatives, self.verification.max_tentatives)
+
+    def test_expired_code(self):
+        EmailVerification.objects.filter(pk=self.verification.pk).update(
+            date_expiration=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertFalse(self.verification.verify_code(self.verification.code))
+
+        self.verification.refresh_from_db()
+        self.assertEqual(self.verification.statut, "EN_ATTENTE")
+        self.assertEqual(self.verification.tentatives, 0)
+
+
+class LoginFailureCounterTests(TestCase):
+    """Compteurs d'échecs de connexion en cache, avec repli sur la base."""
+
+    email = "alice@example.com"
+    ip_address = "10.0.0.1"
+
+    def setUp(self):
+        cache.clear()
+        for _attempt in range(3):
+            LoginAttempt.objects.create(email_tente=self.email, statut="ECHEC", adresse_ip=self.ip_address)
+
+    def test_cache_miss_counts_in_database(self):
+        # Compteurs absents (cache vidé) : les échecs enregistrés restent comptés
+        self.assertEqual(LoginAttempt.get_recent_failures(self.email), 3)
+        self.assertTrue(LoginAttempt.is_ip_blocked(self.ip_address, max_attempts=3))
+
+    def test_cached_counter_is_used(self):
+        ratelimit.register_login_failure(self.email, self.ip_address)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(LoginAttempt.get_recent_failures(self.email), 1)
+            self.assertFalse(LoginAttempt.is_ip_blocked(self.ip_address, max_attempts=3))
+
+
+class PasswordResetUseTokenTests(TestCase):
+    """Consommation unique d'un token de réinitialisation."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.reset = PasswordReset.objects.create(
+            utilisateur=self.user,
+            adresse_ip_creation="127.0.0.1",
+        )
+
+    def test_second_use_returns_false(self):
+        # Deux instances chargées avant la première utilisation (requêtes concurrentes)
+        concurrent = PasswordReset.objects.get(pk=self.reset.pk)
+
+        self.assertTrue(self.reset.use_token("127.0.0.1"))
+        self.assertFalse(concurrent.use_token("10.0.0.1"))
+        self.assertFalse(self.reset.use_token("127.0.0.1"))
+
+        self.reset.refresh_from_db()
+        self.assertEqual(self.reset.statut, "UTILISE")
+        self.assertEqual(self.reset.adresse_ip_utilisation, "127.0.0.1")
+
+
+class PasswordResetTokenHashTests(TestCase):
+    """Stockage du token de réinitialisation sous forme d'empreinte HMAC."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.reset = PasswordReset.objects.create(
+            utilisateur=self.user,
+            adresse_ip_creation="127.0.0.1",
+        )
+        self.raw_token = self.reset.raw_token
+
+    def test_raw_token_resolves_through_hash(self):
+        self.assertEqual(PasswordReset.get_active(self.raw_token).pk, self.reset.pk)
+
+    def test_tampered_token_does_not_resolve(self):
+        tampered = self.raw_token[:-1] + ("A" if self.raw_token[-1] != "A" else "B")
+
+        with self.assertRaises(PasswordReset.DoesNotExist):
+            PasswordReset.get_active(tampered)
+
+    def test_expired_token_does_not_resolve(self):
+        PasswordReset.objects.filter(pk=self.reset.pk).update(
+            date_expiration=timezone.now() - timedelta(minutes=1)
+        )
+
+        with self.assertRaises(PasswordReset.DoesNotExist):
+            PasswordReset.get_active(self.raw_token)
+
+    def test_plaintext_token_is_never_persisted(self):
+        stored = PasswordReset.objects.values_list("token", flat=True).get(pk=self.reset.pk)
+
+        self.assertEqual(stored, PasswordReset.hash_token(self.raw_token))
+        self.assertNotEqual(stored, self.raw_token)
+        self.assertFalse(PasswordReset.objects.filter(token=self.raw_token).exists())
+        # Un rechargement depuis la base ne donne pas accès au token en clair
+        self.assertFalse(hasattr(PasswordReset.objects.get(pk=self.reset.pk), "raw_token"))
+
+
+@mock.patch("apps.authentication.views.send_password_reset_email")
+class PasswordResetRequestTests(TestCase):
+    """Demande de réinitialisation : seul l'identifiant de la demande est mis en file."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.client = APIClient()
+
+    def request_reset(self, email):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("password-reset"), {"email": email}, format="json")
+
+    def test_reset_id_is_enqueued(self, send_password_reset_email_mock):
+        response = self.request_reset(self.user.email)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        password_reset = PasswordReset.objects.get(utilisateur=self.user)
+        send_password_reset_email_mock.delay.assert_called_once_with(password_reset.pk)
+
+    def test_broker_failure_gives_same_response_as_unknown_email(self, send_password_reset_email_mock):
+        send_password_reset_email_mock.delay.side_effect = ConnectionError("broker indisponible")
+
+        with self.assertLogs("apps.core.utils", level="ERROR"):
+            response = self.request_reset(self.user.email)
+        unknown = self.request_reset("inconnu@example.com")
+
+        self.assertEqual(response.status_code, unknown.status_code)
+        self.assertEqual(response.data, unknown.data)
+
+
+@mock.patch("apps.authentication.tasks.send_worker_mail")
+class SendPasswordResetEmailTests(TestCase):
+    """Le token envoyé par email est généré par la tâche."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.password_reset = PasswordReset.objects.create(
+            utilisateur=self.user,
+            adresse_ip_creation="127.0.0.1",
+        )
+
+    def test_sent_token_resolves_to_the_request(self, send_worker_mail):
+        send_password_reset_email(self.password_reset.pk)
+
+        message = send_worker_mail.call_args.kwargs["message"]
+        reset_token = message.split("/reset-password/", 1)[1].split()[0]
+        self.assertEqual(PasswordReset.get_active(reset_token).pk, self.password_reset.pk)
+        # Le token généré à la création n'est plus valable
+        with self.assertRaises(PasswordReset.DoesNotExist):
+            PasswordReset.get_active(self.password_reset.raw_token)
+
+    def test_used_request_sends_nothing(self, send_worker_mail):
+        self.password_reset.use_token("127.0.0.1")
+
+        send_password_reset_email(self.password_reset.pk)
+
+        send_worker_mail.assert_not_called()
+
+
+class RecoveryCodeTests(TestCase):
+    """Codes de récupération 2FA stockés sous forme d'empreintes SHA-256."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.two_factor_auth = TwoFactorAuth.objects.create(utilisateur=self.user)
+        self.codes = self.two_factor_auth.generate_recovery_codes()
+        self.two_factor_auth.save(update_fields=["codes_recuperation_hashes"])
+
+    def test_codes_are_stored_as_sha256_hashes_only(self):
+        stored = TwoFactorAuth.objects.get(pk=self.two_factor_auth.pk).codes_recuperation_hashes
+
+        self.assertEqual(stored, [hashlib.sha256(code.encode()).hexdigest() for code in self.codes])
+        for code in self.codes:
+            self.assertNotIn(code, stored)
+
+    def test_code_works_exactly_once(self):
+        code = self.codes[0]
+
+        self.assertTrue(self.two_factor_auth.use_recovery_code(code))
+        self.assertFalse(self.two_factor_auth.use_recovery_code(code))
+        self.assertFalse(TwoFactorAuth.objects.get(pk=self.two_factor_auth.pk).use_recovery_code(code))
+
+        stored = TwoFactorAuth.objects.get(pk=self.two_factor_auth.pk)
+        self.assertEqual(stored.recovery_codes_count, len(self.codes) - 1)
+        # Les autres codes restent utilisables
+        self.assertTrue(stored.use_recovery_code(self.codes[1]))
+
+    def test_unknown_code_is_rejected(self):
+        self.assertFalse(self.two_factor_auth.use_recovery_code("INCONNU234"))
+        self.assertFalse(self.two_factor_auth.use_recovery_code(None))
+
+
+class RecoveryCodeHashMigrationTests(TransactionTestCase):
+    """Migration 0006 : conversion des codes chiffrés existants en empreintes."""
+
+    migrate_from = [("authentication", "0005_status_expiry_indexes")]
+    migrate_to = [("authentication", "0006_recovery_code_hashes")]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        self.old_apps = executor.loader.project_state(self.migrate_from).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_existing_codes_are_converted_to_hashes(self):
+        OldUser = self.old_apps.get_model("users", "User")
+        OldTwoFactorAuth = self.old_apps.get_model("authentication", "TwoFactorAuth")
+        cipher_suite = Fernet(settings.SOCIAL_ACCOUNT_ENCRYPTION_KEY.encode())
+        codes = ["ABCDEFGH23", "JKLMNPQR45"]
+        user = OldUser.objects.create(username="alice", email="alice@example.com", telephone="+2290100000001")
+        OldTwoFactorAuth.objects.create(
+            utilisateur=user,
+            # Un code indéchiffrable est ignoré par la migration
+            codes_recuperation_encrypted=[cipher_suite.encrypt(code.encode()).decode() for code in codes] + ["invalide"],
+        )
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        new_apps = executor.loader.project_state(self.migrate_to).apps
+
+        migrated = new_apps.get_model("authentication", "TwoFactorAuth").objects.get(utilisateur_id=user.pk)
+        self.assertEqual(
+            migrated.codes_recuperation_hashes,
+            [hashlib.sha256(code.encode()).hexdigest() for code in codes]
+        )
+        self.assertFalse(hasattr(migrated, "codes_recuperation_encrypted"))
+
+
+@mock.patch("apps.authentication.views.send_2fa_sms")
+class TwoFactorSetupVerifyTests(TestCase):
+    """Configuration 2FA par SMS : code en attente conservé en cache."""
+
+    phone_number = "+2290197000001"
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def setup_two_factor(self, send_2fa_sms):
+        """Lance la configuration et retourne le code envoyé par SMS."""
+        response = self.client.post(
+            reverse("2fa-setup"), {"phone_number": self.phone_number}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        phone_number, code = send_2fa_sms.delay.call_args.args
+        self.assertEqual(phone_number, self.phone_number)
+        return code
+
+    def verify(self, code):
+        return self.client.post(
+            reverse("2fa-verify"), {"code": code, "phone_number": self.phone_number}, format="json"
+        )
+
+    def test_setup_stores_pending_code(self, send_2fa_sms):
+        code = self.setup_two_factor(send_2fa_sms)
+
+        self.assertEqual(
+            cache.get(two_factor_setup_key(self.user.pk)),
+            {"phone_number": self.phone_number, "code": code}
+        )
+
+    def test_verify_with_correct_code(self, send_2fa_sms):
+        code = self.setup_two_factor(send_2fa_sms)
+
+        response = self.verify(code)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(TwoFactorAuth.objects.get(utilisateur=self.user).actif)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.telephone, self.phone_number)
+        self.assertIsNone(cache.get(two_factor_setup_key(self.user.pk)))
+        # Usage unique : le même code est ensuite refusé
+        self.assertEqual(self.verify(code).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_verify_with_wrong_code(self, send_2fa_sms):
+        code = self.setup_two_factor(send_2fa_sms)
+
+        response = self.verify(other_code(code))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TwoFactorAuth.objects.filter(utilisateur=self.user, actif=True).exists())
+        # Le code en attente reste valable après une erreur de saisie
+        self.assertIsNotNone(cache.get(two_factor_setup_key(self.user.pk)))
+
+    def test_verify_after_pending_code_expired(self, send_2fa_sms):
+        code = self.setup_two_factor(send_2fa_sms)
+        # Expiration du TTL simulée par la suppression de la clé
+        cache.delete(two_factor_setup_key(self.user.pk))
+
+        response = self.verify(code)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TwoFactorAuth.objects.filter(utilisateur=self.user, actif=True).exists())
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.telephone, self.phone_number)
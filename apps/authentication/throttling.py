@@ -0,0 +1,25 @@
+"""
+Limiteurs de débit DRF pour l'application authentication.
+"""
+
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class PasswordResetEmailThrottle(SimpleRateThrottle):
+    """
+    Limite les demandes de réinitialisation par adresse email ciblée.
+
+    Complète la limite par IP : des demandes réparties sur plusieurs IP
+    vers un même compte sont aussi bornées. L'email est haché dans la clé.
+    """
+
+    scope = 'password_reset_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not email or not isinstance(email, str):
+            return None
+        ident = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
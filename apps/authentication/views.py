@@ -8,84 +8,148 @@ l'authentification avancée et les connexions sociales.
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import get_user_model, login
-from django.core.mail import send_mail
-from django.conf import settings
-from django.utils.crypto import get_random_string
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Q
 from django.utils import timezone
 from datetime import timedelta
-import secrets
+import hmac
 import logging
+import secrets
 
-from .models import SocialAccount, LoginAttempt
+from .authentication import invalidate_user_tokens
+from .models import SocialAccount, LoginAttempt, PasswordReset, TwoFactorAuth
+from .services import login_attempt_buffer
+from .throttling import PasswordResetEmailThrottle
+from .tasks import send_2fa_sms, send_password_reset_email
 from .serializers import (
     SocialAccountSerializer, GoogleAuthSerializer, FacebookAuthSerializer,
     LoginAttemptSerializer, TwoFactorSetupSerializer, TwoFactorVerifySerializer,
     PasswordResetRequestSerializer, PasswordResetConfirmSerializer,
     AccountActivationSerializer
 )
+from apps.core.utils import cache_delete, cache_get, cache_set, enqueue_task, get_client_ip
 from apps.users.serializers import UserProfileSerializer
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Durée de vie (en secondes) du profil sérialisé en cache ; borne
+# aussi le retard des compteurs (followers, événements) qui ne modifient pas l'utilisateur
+USER_PROFILE_CACHE_TIMEOUT = 300
+
+# Durée de validité (en secondes) d'un code de configuration 2FA
+TWO_FACTOR_CODE_TIMEOUT = 300
+
+# Colonnes utilisateur lues par UserPublicSerializer (imbriqué dans les listes)
+USER_PUBLIC_ONLY_FIELDS = (
+    'utilisateur__id', 'utilisateur__username', 'utilisateur__first_name',
+    'utilisateur__last_name', 'utilisateur__photo_profil', 'utilisateur__bio',
+    'utilisateur__est_verifie',
+)
+
 
-class GoogleAuthView(generics.CreateAPIView):
+def serialize_user_cached(user):
     """
-    Vue pour l'authentification Google OAuth.
+    Retourne le profil sérialisé de l'utilisateur, mis en cache.
+
+    La clé contient date_modification : toute modification de l'utilisateur
+    utilise une nouvelle clé, sans invalidation explicite.
+    """
+    key = f"userprof:{user.pk}:{int(user.date_modification.timestamp())}"
+    data = cache_get(key)
+    if data is None:
+        data = UserProfileSerializer(user).data
+        cache_set(key, data, USER_PROFILE_CACHE_TIMEOUT)
+    return data
+
+
+def get_or_create_token(user):
+    """
+    Retourne le token DRF de l'utilisateur, créé s'il n'existe pas.
+
+    Contrairement à get_or_create(), la lecture ne s'exécute pas dans un
+    savepoint ; seule la création (première connexion) en ouvre un.
+    """
+    token = Token.objects.filter(user=user).only('key').first()
+    if token is not None:
+        return token
+    try:
+        with transaction.atomic():
+            return Token.objects.create(user=user)
+    except IntegrityError:
+        # Créé entre-temps par une connexion concurrente
+        return Token.objects.only('key').get(user=user)
+
+
+def two_factor_setup_key(user_id):
+    """Clé de cache du code 2FA en attente de vérification."""
+    return f"2fa:setup:{user_id}"
+
+
+class BaseOAuthLoginView(generics.CreateAPIView):
+    """
+    Vue de base pour l'authentification via un fournisseur OAuth.
     
-    POST /api/auth/google/
+    Les sous-classes définissent serializer_class, provider_name et throttle_scope.
     """
     
-    serializer_class = GoogleAuthSerializer
+    provider_name = ''
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
     
     def create(self, request, *args, **kwargs):
-        """Authentifie un utilisateur via Google."""
+        """Authentifie un utilisateur via le fournisseur OAuth."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
         try:
             user = serializer.save()
             
-            # Créer ou récupérer le token
-            token, created = Token.objects.get_or_create(user=user)
+            # Récupérer le token (cas courant) ou le créer à la première connexion
+            token = get_or_create_token(user)
             
-            # Connecter l'utilisateur
-            login(request, user)
+            # Session Django uniquement pour les clients web (les clients API utilisent le token)
+            if request.headers.get('X-Client-Type') == 'web':
+                login(request, user)
             
-            # Enregistrer la tentative de connexion
-            LoginAttempt.objects.create(
+            # Enregistrer la tentative de connexion (insertion groupée en arrière-plan)
+            login_attempt_buffer.put(LoginAttempt(
                 utilisateur=user,
-                adresse_ip=self.get_client_ip(request),
+                adresse_ip=get_client_ip(request),
                 user_agent=request.META.get('HTTP_USER_AGENT', ''),
                 statut="REUSSI"
-            )
+            ))
             
             return Response({
-                'message': 'Connexion Google réussie',
-                'user': UserProfileSerializer(user).data,
+                'message': f'Connexion {self.provider_name} réussie',
+                'user': serialize_user_cached(user),
                 'token': token.key
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f'Google auth error: {e}')
+            logger.error(f'{self.provider_name} auth error: {e}')
             return Response({
-                'error': 'Erreur lors de l\'authentification Google'
+                'error': f'Erreur lors de l\'authentification {self.provider_name}'
             }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class GoogleAuthView(BaseOAuthLoginView):
+    """
+    Vue pour l'authentification Google OAuth.
     
-    def get_client_ip(self, request):
-        """Récupère l'adresse IP du client."""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+    POST /api/auth/google/
+    """
+    
+    serializer_class = GoogleAuthSerializer
+    provider_name = 'Google'
+    throttle_scope = 'google_auth'
 
 
-class FacebookAuthView(generics.CreateAPIView):
+class FacebookAuthView(BaseOAuthLoginView):
     """
     Vue pour l'authentification Facebook OAuth.
     
@@ -93,50 +157,8 @@ class FacebookAuthView(generics.CreateAPIView):
     """
     
     serializer_class = FacebookAuthSerializer
-    permission_classes = [permissions.AllowAny]
-    
-    def create(self, request, *args, **kwargs):
-        """Authentifie un utilisateur via Facebook."""
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        try:
-            user = serializer.save()
-            
-            # Créer ou récupérer le token
-            token, created = Token.objects.get_or_create(user=user)
-            
-            # Connecter l'utilisateur
-            login(request, user)
-            
-            # Enregistrer la tentative de connexion
-            LoginAttempt.objects.create(
-                utilisateur=user,
-                adresse_ip=self.get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                statut="REUSSI"
-            )
-            
-            return Response({
-                'message': 'Connexion Facebook réussie',
-                'user': UserProfileSerializer(user).data,
-                'token': token.key
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            logger.error(f'Facebook auth error: {e}')
-            return Response({
-                'error': 'Erreur lors de l\'authentification Facebook'
-            }, status=status.HTTP_400_BAD_REQUEST)
-    
-    def get_client_ip(self, request):
-        """Récupère l'adresse IP du client."""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+    provider_name = 'Facebook'
+    throttle_scope = 'facebook_auth'
 
 
 class SocialAccountListView(generics.ListAPIView):
@@ -154,6 +176,9 @@ class SocialAccountListView(generics.ListAPIView):
         return SocialAccount.objects.filter(
             utilisateur=self.request.user,
             actif=True
+        ).select_related('utilisateur').only(
+            'id', 'provider', 'social_id', 'email', 'nom_complet',
+            'photo_url', 'date_creation', 'actif', *USER_PUBLIC_ONLY_FIELDS
         )
 
 
@@ -166,24 +191,26 @@ def disconnect_social_account(request, provider):
     DELETE /api/auth/social-accounts/{provider}/disconnect/
     """
     
-    try:
-        social_account = SocialAccount.objects.get(
+    # Les fournisseurs sont stockés en majuscules (contrainte social_account_provider_valid) :
+    # un fournisseur inconnu ne peut correspondre à aucune ligne
+    provider_value = provider.upper()
+    disconnected = 0
+    if provider_value in SocialAccount._PROVIDER_VALUES:
+        # Désactivation en un seul UPDATE, le nombre de lignes indique si le compte existait
+        disconnected = SocialAccount.objects.filter(
             utilisateur=request.user,
-            provider=provider.upper(),
+            provider=provider_value,
             actif=True
-        )
-        
-        social_account.actif = False
-        social_account.save()
-        
-        return Response({
-            'message': f'Compte {provider} déconnecté avec succès'
-        }, status=status.HTTP_200_OK)
-        
-    except SocialAccount.DoesNotExist:
+        ).update(actif=False, date_modification=timezone.now())
+    
+    if not disconnected:
         return Response({
             'error': f'Aucun compte {provider} connecté trouvé'
         }, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response({
+        'message': f'Compte {provider} déconnecté avec succès'
+    }, status=status.HTTP_200_OK)
 
 
 class LoginAttemptListView(generics.ListAPIView):
@@ -200,6 +227,9 @@ class LoginAttemptListView(generics.ListAPIView):
         """Retourne les tentatives de connexion de l'utilisateur."""
         return LoginAttempt.objects.filter(
             utilisateur=self.request.user
+        ).select_related('utilisateur').only(
+            'id', 'adresse_ip', 'user_agent', 'statut', 'date_tentative',
+            'raison_echec', *USER_PUBLIC_ONLY_FIELDS
         ).order_by('-date_tentative')[:20]
 
 
@@ -212,6 +242,8 @@ class TwoFactorSetupView(generics.CreateAPIView):
     
     serializer_class = TwoFactorSetupSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'two_factor_setup'
     
     def create(self, request, *args, **kwargs):
         """Configure l'authentification à deux facteurs."""
@@ -221,19 +253,20 @@ class TwoFactorSetupView(generics.CreateAPIView):
         phone_number = serializer.validated_data['phone_number']
         
         # Générer un code de vérification
-        verification_code = get_random_string(6, allowed_chars='0123456789')
+        verification_code = f"{secrets.randbelow(1_000_000):06d}"
         
-        # Créer un objet TwoFactorAuth
-        two_factor_auth = TwoFactorAuth.objects.create(
-            utilisateur=request.user,
-            phone_number=phone_number,
-            verification_code=verification_code,
-            date_expiration=timezone.now() + timedelta(minutes=5)
-        )
+        # Code en attente conservé en cache : l'expiration est gérée par le TTL
+        if not cache_set(
+            two_factor_setup_key(request.user.pk),
+            {'phone_number': phone_number, 'code': verification_code},
+            TWO_FACTOR_CODE_TIMEOUT
+        ):
+            return Response({
+                'error': 'Service temporairement indisponible, réessayez plus tard'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         
-        # Envoyer le code par SMS (simulation)
-        # En production, intégrez un service SMS comme Twilio
-        logger.info(f'Code 2FA pour {phone_number}: {verification_code}')
+        # Envoyer le code par SMS (tâche asynchrone)
+        send_2fa_sms.delay(phone_number, verification_code)
         
         return Response({
             'message': 'Code de vérification envoyé par SMS',
@@ -250,6 +283,8 @@ class TwoFactorVerifyView(generics.CreateAPIView):
     
     serializer_class = TwoFactorVerifySerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'two_factor_verify'
     
     def create(self, request, *args, **kwargs):
         """Vérifie le code 2FA."""
@@ -261,32 +296,42 @@ class TwoFactorVerifyView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)        
         code = serializer.validated_data['code']
         
-        try:
-            two_factor_auth = TwoFactorAuth.objects.get(
-                utilisateur=request.user,
-                phone_number=phone_number,
-                statut='EN_ATTENTE',
-                date_expiration__gt=timezone.now()
-            )
-        except TwoFactorAuth.DoesNotExist:
+        # Code en attente lu en cache (absent = expiré)
+        pending_key = two_factor_setup_key(request.user.pk)
+        pending = cache_get(pending_key)
+        if (
+            pending is None
+            or (phone_number and phone_number != pending['phone_number'])
+            or not hmac.compare_digest(code, pending['code'])
+        ):
             return Response({
-                'error': 'Aucune configuration 2FA en cours ou expirée'
+                'error': 'Code incorrect ou configuration 2FA expirée'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        if code != two_factor_auth.verification_code:
+        # Usage unique : seule la requête qui supprime la clé poursuit
+        if not cache_delete(pending_key):
             return Response({
-                'error': 'Code incorrect'
+                'error': 'Code incorrect ou configuration 2FA expirée'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Activer 2FA pour l\'utilisateur
-        user = request.user
-        user.telephone = two_factor_auth.phone_number
-        user.save()
-
-        # Marquer la 2FA comme vérifiée
-        two_factor_auth.statut = 'VERIFIE'
-        two_factor_auth.date_verification = timezone.now()
-        two_factor_auth.save()
+        now = timezone.now()
+        with transaction.atomic():
+            # Activer 2FA pour l'utilisateur
+            User.objects.filter(pk=request.user.pk).update(
+                telephone=pending['phone_number'],
+                date_modification=now
+            )
+            TwoFactorAuth.objects.update_or_create(
+                utilisateur=request.user,
+                defaults={
+                    'actif': True,
+                    'methode': 'SMS',
+                    'date_activation': now,
+                    'date_desactivation': None
+                }
+            )
+            # update() ne déclenche pas post_save : invalider le cache d'authentification
+            invalidate_user_tokens(request.user.pk)
 
         return Response({
             'message': 'Authentification à deux facteurs activée avec succès'
@@ -302,6 +347,8 @@ class PasswordResetRequestView(generics.CreateAPIView):
     
     serializer_class = PasswordResetRequestSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle, PasswordResetEmailThrottle]
+    throttle_scope = 'password_reset'
     
     def create(self, request, *args, **kwargs):
         """Envoie un email de réinitialisation de mot de passe."""
@@ -311,41 +358,17 @@ class PasswordResetRequestView(generics.CreateAPIView):
         email = serializer.validated_data['email']
         
         try:
-            user = User.objects.get(email=email, is_active=True)
+            user = User.objects.only('id').get(email=email, is_active=True)
             
-            # Générer un token de réinitialisation
-            reset_token = secrets.token_urlsafe(32)
-            
-            # Créer un objet PasswordReset
+            # Créer un objet PasswordReset (seule l'empreinte du token est stockée)
             password_reset = PasswordReset.objects.create(
                 utilisateur=user,
-                token=reset_token,
-                adresse_ip_creation=self.get_client_ip(request)
+                adresse_ip_creation=get_client_ip(request)
             )
             
-            # Envoyer l'email
-            reset_url = f"{settings.FRONTEND_URL}/reset-password/{reset_token}"
-            
-            send_mail(
-                subject='Réinitialisation de votre mot de passe SpotVibe',
-                message=f'''
-                Bonjour {user.first_name},
-                
-                Vous avez demandé la réinitialisation de votre mot de passe.
-                
-                Cliquez sur le lien suivant pour réinitialiser votre mot de passe :
-                {reset_url}
-                
-                Ce lien expire dans 1 heure.
-                
-                Si vous n'avez pas demandé cette réinitialisation, ignorez cet email.
-                
-                L'équipe SpotVibe
-                ''',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                fail_silently=False,
-            )
+            # Envoyer l'email (tâche asynchrone) : seul l'identifiant de la demande
+            # transite par le broker, une panne est journalisée sans changer la réponse
+            transaction.on_commit(lambda: enqueue_task(send_password_reset_email, password_reset.pk))
             
             return Response({
                 'message': 'Email de réinitialisation envoyé'
@@ -367,6 +390,8 @@ class PasswordResetConfirmView(generics.CreateAPIView):
     
     serializer_class = PasswordResetConfirmSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'password_reset_confirm'
     
     def create(self, request, *args, **kwargs):
         """Confirme la réinitialisation du mot de passe."""
@@ -377,30 +402,32 @@ class PasswordResetConfirmView(generics.CreateAPIView):
         new_password = serializer.validated_data['new_password']
         
         try:
-            password_reset = PasswordReset.objects.get(
-                token=token,
-                statut='ACTIF',
-                date_expiration__gt=timezone.now()
-            )
+            password_reset = PasswordReset.get_active(token)
         except PasswordReset.DoesNotExist:
             return Response({
                 'error': 'Token invalide ou expiré'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        user = password_reset.utilisateur
-        user.set_password(new_password)
-        user.save()
+        with transaction.atomic():
+            # Marquer le token comme utilisé (UPDATE conditionnel : usage unique)
+            if not password_reset.use_token(get_client_ip(request)):
+                return Response({
+                    'error': 'Token invalide ou expiré'
+                }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Marquer le token comme utilisé
-        password_reset.statut = 'UTILISE'
-        password_reset.date_utilisation = timezone.now()
-        password_reset.adresse_ip_utilisation = self.get_client_ip(request)
-        password_reset.save()
+            # Écriture ciblée du mot de passe plutôt qu'un save() de toute la ligne
+            User.objects.filter(pk=password_reset.utilisateur_id).update(
+                password=make_password(new_password),
+                date_modification=timezone.now()
+            )
+            # update() ne déclenche pas post_save : invalider le cache d'authentification
+            invalidate_user_tokens(password_reset.utilisateur_id)
 
         return Response({
             'message': 'Mot de passe réinitialisé avec succès'
         }, status=status.HTTP_200_OK)
 
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def auth_status_view(request):
@@ -418,21 +445,20 @@ def auth_status_view(request):
         actif=True
     ).values('provider', 'email')
     
-    # Dernière tentative de connexion
-    last_login_attempt = LoginAttempt.objects.filter(
-        utilisateur=user,
-        reussi=True
-    ).order_by('-date_tentative').first()
+    # Dernière connexion réussie et tentatives sur 30 jours, en une seule requête
+    login_stats = LoginAttempt.objects.filter(utilisateur=user).aggregate(
+        last_login=Max('date_tentative', filter=Q(statut='REUSSI')),
+        login_attempts_count=Count(
+            'id', filter=Q(date_tentative__gte=timezone.now() - timedelta(days=30))
+        ),
+    )
     
     status_data = {
-        'user': UserProfileSerializer(user).data,
+        'user': serialize_user_cached(user),
         'social_accounts': list(social_accounts),
         'two_factor_enabled': bool(user.telephone),
-        'last_login': last_login_attempt.date_tentative if last_login_attempt else None,
-        'login_attempts_count': LoginAttempt.objects.filter(
-            utilisateur=user,
-            date_tentative__gte=timezone.now() - timedelta(days=30)
-        ).count()
+        'last_login': login_stats['last_login'],
+        'login_attempts_count': login_stats['login_attempts_count'],
     }
     
     return Response(status_data, status=status.HTTP_200_OK)
@@ -3,10 +3,15 @@ Configuration de l'interface d'administration pour les modèles core.
 """
 
 from django.contrib import admin
-from django.utils.html import format_html
+from django.db import transaction
+from django.utils import timezone
+from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from .models import AppSettings, AuditLog, ContactMessage, FAQ, SystemStatus
 
+# Nombre de messages mis à jour par transaction dans les actions groupées
+UPDATE_BATCH_SIZE = 500
+
 
 @admin.register(AppSettings)
 class AppSettingsAdmin(admin.ModelAdmin):
@@ -43,18 +48,26 @@ class AuditLogAdmin(admin.ModelAdmin):
     """Interface d'administration pour les logs d'audit."""
     
     list_display = [
-        'utilisateur', 'action', 'description', 'date_action', 'adresse_ip'
+        'utilisateur', 'action', 'target_display', 'description',
+        'date_action', 'adresse_ip'
     ]
     
     list_filter = ['action', 'date_action', 'content_type']
-    search_fields = ['utilisateur__username', 'description', 'adresse_ip']
+    list_select_related = ['utilisateur']
+    search_fields = ['utilisateur__username', 'description', 'adresse_ip', 'target_key']
     
     readonly_fields = [
         'utilisateur', 'action', 'description', 'content_type',
-        'object_id', 'adresse_ip', 'user_agent', 'donnees_avant',
+        'object_id', 'target_key', 'target_display', 'adresse_ip', 'user_agent', 'donnees_avant',
         'donnees_apres', 'date_action'
     ]
     
+    def get_queryset(self, request):
+        """Ne charge pas les données JSON ni le user agent, absents de la liste."""
+        return super().get_queryset(request).defer(
+            'donnees_avant', 'donnees_apres', 'user_agent'
+        )
+    
     def has_add_permission(self, request):
         """Empêche l'ajout manuel de logs."""
         return False
@@ -78,6 +91,7 @@ class ContactMessageAdmin(admin.ModelAdmin):
     ]
     
     list_filter = ['categorie', 'statut', 'date_creation']
+    list_select_related = ['assigne_a']
     search_fields = ['nom', 'email', 'sujet', 'message']
     
     list_editable = ['statut', 'assigne_a']
@@ -102,16 +116,46 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     actions = ['assign_to_me', 'mark_as_resolved']
     
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """
+        Partage les choix de assigne_a entre les lignes de la liste éditable.
+        
+        Sans cela, chaque ligne (list_editable) relit la table des utilisateurs.
+        """
+        formfield = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'assigne_a' and formfield is not None:
+            choices = getattr(request, '_assigne_a_choices', None)
+            if choices is None:
+                choices = request._assigne_a_choices = list(formfield.choices)
+            formfield.choices = choices
+        return formfield
+    
+    def update_in_batches(self, queryset, **values):
+        """
+        Met à jour la sélection par lots de UPDATE_BATCH_SIZE lignes.
+        
+        Chaque lot est une transaction courte : une grande sélection ne
+        verrouille pas toutes ses lignes pendant une seule requête.
+        """
+        ids = list(queryset.values_list('id', flat=True))
+        updated = 0
+        for start in range(0, len(ids), UPDATE_BATCH_SIZE):
+            with transaction.atomic():
+                updated += ContactMessage.objects.filter(
+                    id__in=ids[start:start + UPDATE_BATCH_SIZE]
+                ).update(**values)
+        return updated
+    
     def assign_to_me(self, request, queryset):
         """Assigne les messages à l'utilisateur actuel."""
-        updated = queryset.update(assigne_a=request.user)
+        updated = self.update_in_batches(queryset, assigne_a=request.user)
         self.message_user(request, f'{updated} message(s) assigné(s) à vous.')
     assign_to_me.short_description = _('M\'assigner les messages')
     
     def mark_as_resolved(self, request, queryset):
         """Marque les messages comme résolus."""
-        from django.utils import timezone
-        updated = queryset.update(
+        updated = self.update_in_batches(
+            queryset,
             statut='RESOLU',
             date_resolution=timezone.now()
         )
@@ -158,6 +202,10 @@ class FAQAdmin(admin.ModelAdmin):
         }),
     ]
     
+    def get_queryset(self, request):
+        """Annote le ratio d'utilité (calculé par la base, triable)."""
+        return super().get_queryset(request).with_usefulness()
+    
     def get_usefulness_ratio(self, obj):
         """Affiche le ratio d'utilité."""
         ratio = obj.get_usefulness_ratio()
@@ -168,11 +216,10 @@ class FAQAdmin(admin.ModelAdmin):
         else:
             color = 'red'
         
-        return format_html(
-            '<span style="color: {};">{:.1f}%</span>',
-            color, ratio
-        )
+        # Couleur littérale et ratio numérique : aucun échappement nécessaire
+        return mark_safe(f'<span style="color: {color};">{ratio:.1f}%</span>')
     get_usefulness_ratio.short_description = _('Utilité')
+    get_usefulness_ratio.admin_order_field = 'usefulness'
 
 
 @admin.register(SystemStatus)
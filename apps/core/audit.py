@@ -0,0 +1,59 @@
+"""
+Enregistrement des logs d'audit.
+
+Les logs sont mis en tampon et insérés par lots (bulk_create) par un
+thread d'arrière-plan : une action auditée n'ajoute pas d'INSERT à la
+requête qui la déclenche.
+"""
+
+import atexit
+
+from django.contrib.contenttypes.models import ContentType
+
+from .buffers import BulkInsertBuffer
+from .models import AuditLog
+from .utils import get_client_ip
+
+audit_log_buffer = BulkInsertBuffer(AuditLog)
+atexit.register(audit_log_buffer.flush)
+
+
+def diff_snapshots(avant, apres):
+    """Réduit deux états d'un objet aux seules clés modifiées."""
+    avant = avant or {}
+    apres = apres or {}
+    changed = [key for key in avant.keys() | apres.keys() if avant.get(key) != apres.get(key)]
+    return (
+        {key: avant[key] for key in changed if key in avant},
+        {key: apres[key] for key in changed if key in apres},
+    )
+
+
+def record(action, utilisateur=None, objet=None, description="", request=None,
+           donnees_avant=None, donnees_apres=None):
+    """
+    Enregistre une action dans les logs d'audit (insertion différée).
+
+    Seules les clés modifiées entre donnees_avant et donnees_apres sont
+    conservées. Les tailles des données JSON sont validées immédiatement :
+    bulk_create n'appelle pas AuditLog.save() ni full_clean().
+    """
+    donnees_avant, donnees_apres = diff_snapshots(donnees_avant, donnees_apres)
+    entry = AuditLog(
+        utilisateur=utilisateur,
+        action=action,
+        description=description,
+        donnees_avant=donnees_avant,
+        donnees_apres=donnees_apres,
+    )
+    if objet is not None:
+        entry.content_type = ContentType.objects.get_for_model(objet)
+        entry.object_id = objet.pk
+        entry.target_key = f"{objet._meta.label_lower}:{objet.pk}"
+        entry.target_display = str(objet)[:255]
+    if request is not None:
+        entry.adresse_ip = get_client_ip(request)
+        entry.user_agent = request.META.get("HTTP_USER_AGENT", "")[:500]
+    entry.clean()
+    audit_log_buffer.put(entry)
+    return entry
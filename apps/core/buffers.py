@@ -0,0 +1,93 @@
+"""
+Tampons d'insertion groupée pour SpotVibe.
+
+Les enregistrements d'historique (tentatives de connexion, logs d'audit)
+sont mis en tampon en mémoire puis insérés par lots avec bulk_create,
+hors du chemin critique des requêtes.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BulkInsertBuffer:
+    """
+    Tampon en mémoire d'instances non sauvegardées d'un modèle.
+
+    Un thread d'arrière-plan vide le tampon toutes les `flush_interval`
+    secondes avec `bulk_create`. Lorsque le tampon est plein, l'instance
+    est insérée de manière synchrone pour ne pas la perdre.
+    """
+
+    def __init__(self, model, max_size=10000, batch_size=500, flush_interval=0.5):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def put(self, instance):
+        """Ajoute une instance non sauvegardée au tampon."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(instance)
+        except queue.Full:
+            logger.warning(f"Tampon {self.model.__name__} plein, insertion synchrone.")
+            self.prepare_batch([instance])
+            instance.save()
+
+    def prepare_batch(self, batch):
+        """Complète les instances d'un lot avant insertion (aucun traitement par défaut)."""
+
+    def flush(self):
+        """Insère en base toutes les instances en attente, par lots."""
+        total = 0
+        while True:
+            batch = self._drain()
+            if not batch:
+                return total
+            try:
+                self.prepare_batch(batch)
+                self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+                total += len(batch)
+            except Exception as e:
+                logger.error(f"Erreur lors de l'insertion groupée de {len(batch)} {self.model.__name__}: {e}")
+
+    def _drain(self):
+        """Retire au plus `batch_size` instances du tampon."""
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _ensure_worker(self):
+        """Démarre le thread de vidage au premier usage (après un éventuel fork)."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name=f"{self.model._meta.model_name}-flusher",
+                    daemon=True,
+                )
+                self._worker.start()
+
+    def _run(self):
+        """Boucle du thread de vidage."""
+        while True:
+            time.sleep(self.flush_interval)
+            if self._queue.empty():
+                continue
+            close_old_connections()
+            self.flush()
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2025-08-13 14:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='auditlog_content_obj',
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['content_type', 'object_id', '-date_action'], name='auditlog_content_obj_date'),
+        ),
+        migrations.AlterField(
+            model_name='contactmessage',
+            name='utilisateur',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='Utilisateur expéditeur (si connecté)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contact_messages', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['utilisateur', '-date_creation'], name='contact_msg_user_date'),
+        ),
+        migrations.RemoveIndex(
+            model_name='faq',
+            name='faq_active_order',
+        ),
+        migrations.AddIndex(
+            model_name='faq',
+            index=models.Index(fields=['actif', 'ordre', 'question'], name='faq_active_order_question'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2025-08-13 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_list_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditlog',
+            name='target_key',
+            field=models.CharField(blank=True, db_index=True, help_text="Identifiant de l'objet concerné (app_label.modele:id)", max_length=100, verbose_name="Clé de l'objet"),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='target_display',
+            field=models.CharField(blank=True, help_text="Représentation de l'objet concerné au moment de l'action", max_length=255, verbose_name='Objet concerné'),
+        ),
+    ]
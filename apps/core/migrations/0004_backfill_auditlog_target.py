@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2025-08-13 15:20
+
+from django.apps import apps as global_apps
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def backfill_auditlog_targets(apps, schema_editor):
+    """Renseigne target_key et target_display des logs antérieurs à leur ajout."""
+    AuditLog = apps.get_model('core', 'AuditLog')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    logs = AuditLog.objects.filter(target_key='', content_type__isnull=False, object_id__isnull=False)
+    for content_type in ContentType.objects.filter(pk__in=logs.values('content_type')):
+        # Modèle courant pour __str__ (les modèles historiques n'ont pas de méthodes)
+        try:
+            model = global_apps.get_model(content_type.app_label, content_type.model)
+        except LookupError:
+            model = None
+        batch = []
+        for log in logs.filter(content_type=content_type).only('pk', 'object_id').iterator(chunk_size=BATCH_SIZE):
+            batch.append(log)
+            if len(batch) >= BATCH_SIZE:
+                _update_targets(AuditLog, content_type, model, batch)
+                batch = []
+        if batch:
+            _update_targets(AuditLog, content_type, model, batch)
+
+
+def _update_targets(AuditLog, content_type, model, batch):
+    """Met à jour un lot de logs d'un même type de contenu."""
+    objects = model._base_manager.in_bulk({log.object_id for log in batch}) if model else {}
+    for log in batch:
+        log.target_key = f"{content_type.app_label}.{content_type.model}:{log.object_id}"
+        objet = objects.get(log.object_id)
+        # Objet supprimé depuis : seule la clé reste disponible
+        log.target_display = str(objet)[:255] if objet is not None else ''
+    AuditLog.objects.bulk_update(batch, ['target_key', 'target_display'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_auditlog_target'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_auditlog_targets, migrations.RunPython.noop),
+    ]
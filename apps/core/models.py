@@ -19,21 +19,41 @@ AMÉLIORATIONS APPORTÉES :
 """
 
 from django.db import models
+from django.db.models.functions import Cast
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.core.validators import MaxLengthValidator, MinValueValidator, EmailValidator
 from django.core.exceptions import ValidationError
-from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 import json
 import logging
 
+from .utils import cache_delete, cache_get, cache_set
+
 User = get_user_model()
 logger = logging.getLogger("spotvibe.core")
 
+# Durée de vie (en secondes) des valeurs typées de AppSettings en cache
+APP_SETTING_CACHE_TIMEOUT = 3600
+
+# Distingue une clé absente du cache d'une valeur None mise en cache
+_MISSING = object()
+
+# Statut système courant (bannière) mis en cache
+SYSTEM_STATUS_CACHE_KEY = "system_status_current"
+SYSTEM_STATUS_CACHE_TIMEOUT = 15
+
+# Liste publique des FAQ sérialisée (invalidée par les signaux de FAQ)
+FAQ_LIST_CACHE_KEY = "core:faq:v2"
+FAQ_LIST_CACHE_TIMEOUT = 300
+
+# Réponse de /api/core/info/ (invalidée par les signaux de AppSettings)
+APP_INFO_CACHE_KEY = "core:app_info:v1"
+APP_INFO_CACHE_TIMEOUT = 300
+
 
 class AppSettings(models.Model):
     """
@@ -133,39 +153,51 @@ class AppSettings(models.Model):
     def save(self, *args, **kwargs):
         """Sauvegarde et invalide le cache."""
         super().save(*args, **kwargs)
-        cache.delete(f"app_setting_{self.cle}") # Invalide le cache lors de la modification
+        cache_delete(self.cache_key(self.cle)) # Invalide le cache lors de la modification
         logger.info(f"Paramètre d'application '{self.cle}' mis à jour et cache invalidé.")
 
-    def get_typed_value(self):
-        """Retourne la valeur convertie selon son type, avec mise en cache."""
-        cache_key = f"app_setting_{self.cle}"
-        cached_value = cache.get(cache_key)
-        if cached_value is not None:
-            return cached_value
+    def delete(self, *args, **kwargs):
+        """Supprime le paramètre et invalide le cache."""
+        cache_delete(self.cache_key(self.cle))
+        return super().delete(*args, **kwargs)
+
+    @staticmethod
+    def cache_key(key):
+        """Clé de cache de la valeur typée d'un paramètre."""
+        return f"app_setting_{key}"
 
+    def get_typed_value(self):
+        """Retourne la valeur convertie selon son type."""
         if self.type_valeur == "INTEGER":
-            value = int(self.valeur)
-        elif self.type_valeur == "FLOAT":
-            value = float(self.valeur)
-        elif self.type_valeur == "BOOLEAN":
-            value = self.valeur.lower() in ("true", "1", "yes", "on")
-        elif self.type_valeur == "JSON":
-            value = json.loads(self.valeur)
-        else:
-            value = self.valeur
-        
-        cache.set(cache_key, value, timeout=3600) # Cache pour 1 heure
-        return value
+            return int(self.valeur)
+        if self.type_valeur == "FLOAT":
+            return float(self.valeur)
+        if self.type_valeur == "BOOLEAN":
+            return self.valeur.lower() in ("true", "1", "yes", "on")
+        if self.type_valeur == "JSON":
+            return json.loads(self.valeur)
+        return self.valeur
 
     @classmethod
     def get_setting(cls, key, default=None):
-        """Méthode utilitaire pour récupérer un paramètre par sa clé."""
+        """
+        Méthode utilitaire pour récupérer un paramètre par sa clé.
+
+        La valeur typée est lue dans le cache ; la base n'est interrogée
+        qu'en cas d'absence (save() et delete() invalident l'entrée).
+        """
+        cache_key = cls.cache_key(key)
+        value = cache_get(cache_key, _MISSING)
+        if value is not _MISSING:
+            return value
         try:
-            setting = cls.objects.get(cle=key)
-            return setting.get_typed_value()
+            setting = cls.objects.only("cle", "valeur", "type_valeur").get(cle=key)
         except cls.DoesNotExist:
             logger.warning(f"Paramètre d'application '{key}' non trouvé, utilisation de la valeur par défaut: {default}")
             return default
+        value = setting.get_typed_value()
+        cache_set(cache_key, value, APP_SETTING_CACHE_TIMEOUT)
+        return value
 
 
 class AuditLog(models.Model):
@@ -242,6 +274,22 @@ class AuditLog(models.Model):
     
     objet_concerne = GenericForeignKey("content_type", "object_id")
     
+    # Objet concerné dénormalisé à l'écriture : les listes l'affichent sans relation générique
+    target_key = models.CharField(
+        _("Clé de l'objet"),
+        max_length=100,
+        blank=True,
+        help_text="Identifiant de l'objet concerné (app_label.modele:id)",
+        db_index=True
+    )
+    
+    target_display = models.CharField(
+        _("Objet concerné"),
+        max_length=255,
+        blank=True,
+        help_text="Représentation de l'objet concerné au moment de l'action"
+    )
+    
     # Métadonnées
     adresse_ip = models.GenericIPAddressField(
         _("Adresse IP"),
@@ -286,7 +334,8 @@ class AuditLog(models.Model):
         indexes = [
             models.Index(fields=["utilisateur", "date_action"], name="auditlog_user_date"),
             models.Index(fields=["action", "date_action"], name="auditlog_action_date"),
-            models.Index(fields=["content_type", "object_id"], name="auditlog_content_obj"),
+            # Historique d'un objet trié par date (préfixe : résolution de la relation générique)
+            models.Index(fields=["content_type", "object_id", "-date_action"], name="auditlog_content_obj_date"),
             models.Index(fields=["adresse_ip", "date_action"], name="auditlog_ip_date"),
         ]
     
@@ -364,7 +413,7 @@ class ContactMessage(models.Model):
         related_name="contact_messages",
         verbose_name=_("Utilisateur"),
         help_text="Utilisateur expéditeur (si connecté)",
-        db_index=True
+        db_index=False # Couvert par l'index contact_msg_user_date
     )
     
     nom = models.CharField(
@@ -477,6 +526,7 @@ class ContactMessage(models.Model):
             models.Index(fields=["statut", "date_creation"], name="contact_msg_status_date"),
             models.Index(fields=["categorie", "statut"], name="contact_msg_category_status"),
             models.Index(fields=["assigne_a", "statut"], name="contact_msg_assignee_status"),
+            models.Index(fields=["utilisateur", "-date_creation"], name="contact_msg_user_date"),
         ]
     
     def clean(self):
@@ -511,6 +561,21 @@ class ContactMessage(models.Model):
         return deleted_count
 
 
+class FAQQuerySet(models.QuerySet):
+    """QuerySet des questions fréquentes."""
+
+    def with_usefulness(self):
+        """Annote le ratio d'utilité (en %) calculé par la base, utilisable pour le tri."""
+        return self.annotate(
+            total_votes=models.F("utile_oui") + models.F("utile_non"),
+            usefulness=models.Case(
+                models.When(total_votes=0, then=models.Value(0.0)),
+                default=Cast("utile_oui", models.FloatField()) * 100.0 / models.F("total_votes"),
+                output_field=models.FloatField(),
+            ),
+        )
+
+
 class FAQ(models.Model):
     """
     Modèle pour les questions fréquemment posées.
@@ -614,13 +679,16 @@ class FAQ(models.Model):
         db_index=True
     )
     
+    objects = FAQQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _("Question fréquente")
         verbose_name_plural = _("Questions fréquentes")
         ordering = ["categorie", "ordre", "question"]
         indexes = [
             models.Index(fields=["categorie", "actif"], name="faq_category_active"),
-            models.Index(fields=["actif", "ordre"], name="faq_active_order"),
+            # Couvre le tri de la liste publique (actif=True, ordre, question)
+            models.Index(fields=["actif", "ordre", "question"], name="faq_active_order_question"),
             models.Index(fields=["question"], name="faq_question_idx"), # Pour les recherches textuelles
         ]
     
@@ -629,28 +697,51 @@ class FAQ(models.Model):
         return self.question
     
     def increment_views(self):
-        """Incrémente le compteur de vues de manière atomique."""
-        self.nombre_vues = models.F("nombre_vues") + 1
-        self.save(update_fields=["nombre_vues"])
-        self.refresh_from_db() # Recharger la valeur mise à jour
+        """Incrémente le compteur de vues de manière atomique (un seul UPDATE, sans relecture)."""
+        FAQ.objects.filter(pk=self.pk).update(nombre_vues=models.F("nombre_vues") + 1)
+        self.nombre_vues += 1
 
     def vote_useful(self, useful=True):
-        """Enregistre un vote d'utilité de manière atomique."""
-        if useful:
-            self.utile_oui = models.F("utile_oui") + 1
-        else:
-            self.utile_non = models.F("utile_non") + 1
-        self.save(update_fields=["utile_oui", "utile_non"])
-        self.refresh_from_db()
+        """Enregistre un vote d'utilité de manière atomique (seul le compteur voté est écrit)."""
+        field = "utile_oui" if useful else "utile_non"
+        FAQ.objects.filter(pk=self.pk).update(**{field: models.F(field) + 1})
+        setattr(self, field, getattr(self, field) + 1)
     
     def get_usefulness_ratio(self):
-        """Calcule le ratio d'utilité."""
+        """Calcule le ratio d'utilité (annotation de with_usefulness() si présente)."""
+        usefulness = getattr(self, "usefulness", None)
+        if usefulness is not None:
+            return usefulness
         total_votes = self.utile_oui + self.utile_non
         if total_votes == 0:
             return 0.0
         return (self.utile_oui / total_votes) * 100.0
 
 
+class SystemStatusQuerySet(models.QuerySet):
+    """QuerySet des statuts système."""
+
+    def active(self, now=None):
+        """
+        Statuts actuellement en cours (équivalent SQL de SystemStatus.is_active).
+
+        Fin réelle, sinon fin prévue, sinon statut différent de
+        OPERATIONNEL / HORS_LIGNE.
+        """
+        now = now or timezone.now()
+        return self.filter(
+            models.Q(date_fin_reelle__isnull=False, date_debut__lte=now, date_fin_reelle__gte=now)
+            | models.Q(
+                date_fin_reelle__isnull=True, date_fin_prevue__isnull=False,
+                date_debut__lte=now, date_fin_prevue__gte=now,
+            )
+            | (
+                models.Q(date_fin_reelle__isnull=True, date_fin_prevue__isnull=True)
+                & ~models.Q(statut__in=["OPERATIONNEL", "HORS_LIGNE"])
+            )
+        )
+
+
 class SystemStatus(models.Model):
     """
     Modèle pour le statut du système et les maintenances.
@@ -766,6 +857,8 @@ class SystemStatus(models.Model):
         db_index=True
     )
     
+    objects = SystemStatusQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _("Statut système")
         verbose_name_plural = _("Statuts système")
@@ -790,7 +883,13 @@ class SystemStatus(models.Model):
         """Sauvegarde avec logging."""
         self.full_clean()
         super().save(*args, **kwargs)
+        cache_delete(SYSTEM_STATUS_CACHE_KEY)
         logger.info(f"Statut système '{self.titre}' mis à jour: {self.statut} (Sévérité: {self.severite}).")
+
+    def delete(self, *args, **kwargs):
+        """Supprime le statut et invalide le statut courant en cache."""
+        cache_delete(SYSTEM_STATUS_CACHE_KEY)
+        return super().delete(*args, **kwargs)
     
     def __str__(self):
         """Représentation string du statut."""
@@ -808,20 +907,28 @@ class SystemStatus(models.Model):
 
     @classmethod
     def get_current_status(cls):
-        """Retourne le statut système actif le plus récent."""
-        active_statuses = cls.objects.filter(
-            date_debut__lte=timezone.now(),
+        """
+        Retourne le statut système actif le plus récent.
+
+        Lu à chaque requête pour la bannière : le résultat est mis en cache
+        SYSTEM_STATUS_CACHE_TIMEOUT secondes (invalidé par save() et delete()).
+        """
+        current = cache_get(SYSTEM_STATUS_CACHE_KEY)
+        if current is not None:
+            return current
+
+        now = timezone.now()
+        current = cls.objects.active(now).filter(
+            date_debut__lte=now,
             statut__in=["DEGRADED", "MAINTENANCE", "INCIDENT", "HORS_LIGNE"]
-        ).exclude(
-            models.Q(date_fin_reelle__isnull=False, date_fin_reelle__lt=timezone.now()) |
-            models.Q(date_fin_prevue__isnull=False, date_fin_prevue__lt=timezone.now())
-        ).order_by("-severite", "-date_debut")
+        ).order_by("-severite", "-date_debut").first()
         
-        if active_statuses.exists():
-            return active_statuses.first()
+        if current is None:
+            # Si aucun incident/maintenance, retourner un statut opérationnel par défaut
+            current = cls(titre="Système Opérationnel", description="Tous les services fonctionnent normalement.", statut="OPERATIONNEL", severite="INFO", date_debut=now)
         
-        # Si aucun incident/maintenance, retourner un statut opérationnel par défaut
-        return cls(titre="Système Opérationnel", description="Tous les services fonctionnent normalement.", statut="OPERATIONNEL", severite="INFO", date_debut=timezone.now())
+        cache_set(SYSTEM_STATUS_CACHE_KEY, current, SYSTEM_STATUS_CACHE_TIMEOUT)
+        return current
 
     @classmethod
     def cleanup_old_statuses(cls, days=365):
@@ -11,6 +11,13 @@ from .models import AppSettings, ContactMessage, FAQ
 
 User = get_user_model()
 
+# Fichiers acceptés par FileUploadSerializer
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+ALLOWED_UPLOAD_TYPES = frozenset({
+    'image/jpeg', 'image/png', 'image/gif',
+    'application/pdf', 'text/plain',
+})
+
 
 class AppSettingsSerializer(serializers.ModelSerializer):
     """
@@ -53,12 +60,6 @@ class ContactMessageCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ContactMessage
         fields = ['nom', 'email', 'sujet', 'message']
-    
-    def validate_email(self, value):
-        """Valide l'adresse email."""
-        if not value or '@' not in value:
-            raise serializers.ValidationError("Adresse email invalide")
-        return value
 
 
 class FAQSerializer(serializers.ModelSerializer):
@@ -137,19 +138,12 @@ class FileUploadSerializer(serializers.Serializer):
     
     def validate_file(self, value):
         """Valide le fichier uploadé."""
-        # Vérifier la taille (10MB max)
-        if value.size > 10 * 1024 * 1024:
+        if value.size > MAX_UPLOAD_SIZE:
             raise serializers.ValidationError(
                 "Le fichier ne peut pas dépasser 10MB"
             )
         
-        # Vérifier le type de fichier
-        allowed_types = [
-            'image/jpeg', 'image/png', 'image/gif',
-            'application/pdf', 'text/plain'
-        ]
-        
-        if value.content_type not in allowed_types:
+        if value.content_type not in ALLOWED_UPLOAD_TYPES:
             raise serializers.ValidationError(
                 "Type de fichier non autorisé"
             )
@@ -211,12 +205,4 @@ class FeedbackSerializer(serializers.Serializer):
     category = serializers.ChoiceField(choices=[
         'app', 'feature', 'bug', 'suggestion'
     ])
-    
-    def validate_rating(self, value):
-        """Valide la note."""
-        if not 1 <= value <= 5:
-            raise serializers.ValidationError(
-                "La note doit être comprise entre 1 et 5"
-            )
-        return value
 
@@ -0,0 +1,66 @@
+"""
+Services pour l'application core.
+
+Ce module contient le calcul des statistiques de l'application et leur
+mise en cache : la tâche Celery refresh_app_statistics les recalcule
+périodiquement, la vue ne les calcule elle-même qu'en cas d'absence.
+"""
+
+import logging
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.events.models import Event
+from apps.payments.models import Payment
+from apps.users.models import User
+from .utils import cache_get, cache_set
+
+logger = logging.getLogger(__name__)
+
+# Statistiques en cache ; la durée de vie couvre plusieurs rafraîchissements périodiques
+APP_STATS_CACHE_KEY = "core:stats:v1"
+APP_STATS_CACHE_TIMEOUT = 120
+
+
+def load_app_statistics():
+    """Calcule les statistiques de l'application (une requête d'agrégation par table)."""
+    # Début de la journée : borne indexable plutôt que __date
+    start_of_day = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    users = User.objects.aggregate(
+        total=Count('id'),
+        active_today=Count('id', filter=Q(last_login__gte=start_of_day))
+    )
+    events = Event.objects.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=Q(date_creation__gte=start_of_day))
+    )
+    payments = Payment.objects.aggregate(
+        total=Count('id'),
+        revenue=Sum('montant', filter=Q(statut='REUSSI'))
+    )
+    
+    return {
+        'total_users': users['total'],
+        'total_events': events['total'],
+        'total_transactions': payments['total'],
+        'total_revenue': float(payments['revenue'] or 0),
+        'active_users_today': users['active_today'],
+        'events_today': events['today']
+    }
+
+
+def refresh_app_statistics_cache():
+    """Recalcule les statistiques et les place en cache."""
+    stats = load_app_statistics()
+    cache_set(APP_STATS_CACHE_KEY, stats, APP_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def get_app_statistics():
+    """Retourne les statistiques en cache, calculées de manière synchrone en cas d'absence."""
+    stats = cache_get(APP_STATS_CACHE_KEY)
+    if stats is None:
+        stats = refresh_app_statistics_cache()
+    return stats
@@ -0,0 +1,23 @@
+"""
+Signaux pour l'application core.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .utils import cache_delete
+from .models import AppSettings, FAQ, APP_INFO_CACHE_KEY, FAQ_LIST_CACHE_KEY
+
+
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=FAQ)
+def invalidate_faq_list_cache(sender, instance, **kwargs):
+    """Invalide la liste des FAQ en cache après modification ou suppression."""
+    cache_delete(FAQ_LIST_CACHE_KEY)
+
+
+@receiver(post_save, sender=AppSettings)
+@receiver(post_delete, sender=AppSettings)
+def invalidate_app_info_cache(sender, instance, **kwargs):
+    """Invalide les informations de l'application en cache après modification d'un paramètre."""
+    cache_delete(APP_INFO_CACHE_KEY)
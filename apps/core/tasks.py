@@ -0,0 +1,45 @@
+"""
+Tâches asynchrones pour l'application core.
+
+Les notifications par email sont envoyées par les workers Celery
+pour ne pas bloquer les requêtes HTTP.
+"""
+
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import send_mail
+
+from .models import ContactMessage
+from .services import refresh_app_statistics_cache
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_contact_email(self, message_id):
+    """Notifie les administrateurs d'un nouveau message de contact."""
+    try:
+        message = ContactMessage.objects.only('nom', 'email', 'sujet', 'message').get(pk=message_id)
+    except ContactMessage.DoesNotExist:
+        logger.warning(f"Message de contact {message_id} introuvable.")
+        return
+
+    try:
+        send_mail(
+            subject=f'Nouveau message de contact: {message.sujet}',
+            message=f'De: {message.nom} ({message.email})\n\n{message.message}',
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[settings.ADMIN_EMAIL],
+            fail_silently=False,
+        )
+    except Exception as exc:
+        logger.error(f'Contact email error: {exc}')
+        raise self.retry(exc=exc)
+
+
+@shared_task
+def refresh_app_statistics():
+    """Recalcule les statistiques de l'application en cache (planifiée par Celery beat)."""
+    refresh_app_statistics_cache()
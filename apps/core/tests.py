@@ -1,3 +1,125 @@
-from django.test import TestCase
+"""
+Tests de l'application core.
+"""
 
-# Create your tests here.
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from . import audit
+from .models import AuditLog, ContactMessage
+
+User = get_user_model()
+
+
+class ContactMessageCreateTests(TestCase):
+    """Création d'un message de contact et notification asynchrone."""
+
+    payload = {
+        "nom": "Alice",
+        "email": "alice@example.com",
+        "sujet": "Question",
+        "message": "Bonjour, une question sur mon compte.",
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    @mock.patch("apps.core.views.send_contact_email")
+    def test_notification_is_enqueued_after_commit(self, send_contact_email):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("contact-messages"), self.payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        message = ContactMessage.objects.get()
+        send_contact_email.delay.assert_called_once_with(message.pk)
+
+    @mock.patch("apps.core.views.send_contact_email")
+    def test_broker_failure_still_returns_201(self, send_contact_email):
+        send_contact_email.delay.side_effect = ConnectionError("broker indisponible")
+
+        with self.assertLogs("apps.core.utils", level="ERROR"):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse("contact-messages"), self.payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(ContactMessage.objects.filter(email=self.payload["email"]).exists())
+
+
+@mock.patch("apps.core.audit.audit_log_buffer")
+class AuditRecordTests(TestCase):
+    """Enregistrement différé des logs d'audit par core.audit.record()."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="MotDePasse1",
+            telephone="+2290100000009",
+        )
+
+    def test_only_changed_keys_are_buffered(self, audit_log_buffer):
+        entry = audit.record(
+            "UPDATE", self.user, self.user, "Suspension",
+            donnees_avant={"is_active": True, "username": "admin"},
+            donnees_apres={"is_active": False, "username": "admin"},
+        )
+
+        audit_log_buffer.put.assert_called_once_with(entry)
+        self.assertEqual(entry.donnees_avant, {"is_active": True})
+        self.assertEqual(entry.donnees_apres, {"is_active": False})
+        self.assertEqual(entry.target_key, f"users.user:{self.user.pk}")
+        self.assertEqual(entry.target_display, str(self.user))
+
+    def test_oversized_snapshot_is_rejected(self, audit_log_buffer):
+        with self.assertRaises(ValidationError):
+            audit.record(
+                "UPDATE", self.user, self.user, "Biographie",
+                donnees_avant={"bio": ""},
+                donnees_apres={"bio": "x" * 10001},
+            )
+
+        audit_log_buffer.put.assert_not_called()
+
+    def test_user_agent_is_capped(self, audit_log_buffer):
+        request = RequestFactory().post("/", HTTP_USER_AGENT="a" * 600, REMOTE_ADDR="10.0.0.1")
+
+        entry = audit.record("LOGIN", self.user, request=request)
+
+        self.assertEqual(len(entry.user_agent), 500)
+        self.assertEqual(entry.adresse_ip, "10.0.0.1")
+
+
+class AuditLogBufferTests(TestCase):
+    """Insertion groupée des logs d'audit mis en tampon par record()."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="MotDePasse1",
+            telephone="+2290100000009",
+        )
+
+    def test_flush_inserts_buffered_entries(self):
+        # Pas de thread de vidage : le tampon est vidé explicitement dans la transaction du test
+        with mock.patch.object(audit.audit_log_buffer, "_ensure_worker"):
+            audit.record(
+                "UPDATE", self.user, self.user, "Suspension",
+                donnees_avant={"is_active": True, "username": "admin"},
+                donnees_apres={"is_active": False, "username": "admin"},
+            )
+            self.assertFalse(AuditLog.objects.exists())
+
+            self.assertEqual(audit.audit_log_buffer.flush(), 1)
+
+        log = AuditLog.objects.get()
+        self.assertEqual(log.utilisateur, self.user)
+        self.assertEqual(log.donnees_avant, {"is_active": True})
+        self.assertEqual(log.donnees_apres, {"is_active": False})
+        self.assertEqual(log.target_key, f"users.user:{self.user.pk}")
@@ -0,0 +1,72 @@
+"""
+Utilitaires partagés par les applications SpotVibe.
+"""
+
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def get_client_ip(request):
+    """Récupère l'adresse IP du client (premier proxy de X-Forwarded-For)."""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',', 1)[0].strip()
+    return request.META.get('REMOTE_ADDR')
+
+
+# Accès au cache tolérant aux pannes : le cache n'est qu'une optimisation,
+# une indisponibilité (Redis arrêté) est journalisée et traitée comme une
+# absence de valeur, sans jamais faire échouer la requête.
+
+def cache_get(key, default=None):
+    """Lit une clé du cache ; retourne `default` si elle est absente ou si le cache est indisponible."""
+    try:
+        return cache.get(key, default)
+    except Exception as e:
+        logger.warning(f"Cache indisponible (lecture de {key}): {e}")
+        return default
+
+
+def cache_set(key, value, timeout):
+    """Écrit une clé dans le cache ; retourne False si le cache est indisponible."""
+    try:
+        cache.set(key, value, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"Cache indisponible (écriture de {key}): {e}")
+        return False
+    return True
+
+
+def cache_delete(key):
+    """Supprime une clé du cache ; retourne True seulement si la clé existait et a été supprimée."""
+    try:
+        return cache.delete(key)
+    except Exception as e:
+        logger.warning(f"Cache indisponible (suppression de {key}): {e}")
+        return False
+
+
+def cache_delete_many(keys):
+    """Supprime plusieurs clés du cache (sans effet si le cache est indisponible)."""
+    try:
+        cache.delete_many(keys)
+    except Exception as e:
+        logger.warning(f"Cache indisponible (suppression de {len(keys)} clés): {e}")
+
+
+def enqueue_task(task, *args):
+    """
+    Met une tâche Celery en file ; retourne False si le broker est indisponible.
+
+    L'erreur est journalisée sans être propagée : la requête qui a déjà
+    enregistré ses données ne doit pas échouer pour une notification.
+    """
+    try:
+        task.delay(*args)
+    except Exception as e:
+        logger.error(f"Mise en file de la tâche {task.name} impossible: {e}")
+        return False
+    return True
@@ -8,13 +8,23 @@ les fonctionnalités de base de l'application.
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Q, Count, Sum
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection, transaction
+from django.db.models import OuterRef, Q, Subquery
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+import hashlib
+import json
 import logging
 
-from .models import AppSettings, ContactMessage, FAQ
+from .models import (
+    AppSettings, ContactMessage, FAQ,
+    APP_INFO_CACHE_KEY, APP_INFO_CACHE_TIMEOUT, FAQ_LIST_CACHE_KEY, FAQ_LIST_CACHE_TIMEOUT
+)
+from .services import get_app_statistics
+from .utils import cache_get, cache_set, enqueue_task
+from .tasks import send_contact_email
 from .serializers import (
     AppSettingsSerializer, ContactMessageSerializer, ContactMessageCreateSerializer,
     FAQSerializer, AppInfoSerializer, AppStatsSerializer,
@@ -22,12 +32,32 @@ from .serializers import (
     HealthCheckSerializer, MaintenanceSerializer, FeedbackSerializer
 )
 from apps.users.models import User
-from apps.events.models import Event, EventParticipation
-from apps.payments.models import Payment
+from apps.events.models import Event, EventMedia, EventParticipation
 
 logger = logging.getLogger(__name__)
 
 
+# Paramètres exposés par app_info et leur valeur par défaut
+APP_INFO_DEFAULTS = {
+    'nom_app': 'SpotVibe',
+    'version': '1.0.0',
+    'description': 'Plateforme de découverte d\'événements locaux',
+    'email_contact': 'contact@spotvibe.com',
+    'telephone_contact': '',
+    'site_web': '',
+    'maintenance_mode': False,
+    'inscription_ouverte': True,
+}
+
+
+def load_app_info():
+    """Construit les informations de l'application à partir des paramètres (une requête)."""
+    app_data = dict(APP_INFO_DEFAULTS)
+    for setting in AppSettings.objects.filter(cle__in=APP_INFO_DEFAULTS).only('cle', 'valeur', 'type_valeur'):
+        app_data[setting.cle] = setting.get_typed_value()
+    return app_data
+
+
 @api_view(['GET'])
 def app_info(request):
     """
@@ -37,26 +67,10 @@ def app_info(request):
     """
     
     try:
-        settings_obj, created = AppSettings.objects.get_or_create(
-            defaults={
-                'nom_app': 'SpotVibe',
-                'version': '1.0.0',
-                'description': 'Plateforme de découverte d\'événements locaux',
-                'email_contact': 'contact@spotvibe.com'
-            }
-        )
-        
-        app_data = {
-            'nom_app': settings_obj.nom_app,
-            'version': settings_obj.version,
-            'description': settings_obj.description,
-            'email_contact': settings_obj.email_contact,
-            'telephone_contact': settings_obj.telephone_contact,
-            'site_web': settings_obj.site_web,
-            'maintenance_mode': settings_obj.maintenance_mode,
-            'inscription_ouverte': settings_obj.inscription_ouverte
-        }
-        
+        app_data = cache_get(APP_INFO_CACHE_KEY)
+        if app_data is None:
+            app_data = load_app_info()
+            cache_set(APP_INFO_CACHE_KEY, app_data, APP_INFO_CACHE_TIMEOUT)
         return Response(app_data, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -75,34 +89,7 @@ def app_statistics(request):
     """
     
     try:
-        total_users = User.objects.count()
-        total_events = Event.objects.count()
-        total_transactions = Payment.objects.count()
-        total_revenue = Payment.objects.filter(
-            statut='REUSSI'
-        ).aggregate(total=Sum('montant'))['total'] or 0
-        
-        # Utilisateurs actifs aujourd'hui
-        today = timezone.now().date()
-        active_users_today = User.objects.filter(
-            last_login__date=today
-        ).count()
-        
-        # Événements créés aujourd'hui
-        events_today = Event.objects.filter(
-            date_creation__date=today
-        ).count()
-        
-        stats_data = {
-            'total_users': total_users,
-            'total_events': total_events,
-            'total_transactions': total_transactions,
-            'total_revenue': float(total_revenue),
-            'active_users_today': active_users_today,
-            'events_today': events_today
-        }
-        
-        return Response(stats_data, status=status.HTTP_200_OK)
+        return Response(get_app_statistics(), status=status.HTTP_200_OK)
         
     except Exception as e:
         logger.error(f'App statistics error: {e}')
@@ -139,33 +126,47 @@ def global_search(request):
                 Q(username__icontains=query) |
                 Q(first_name__icontains=query) |
                 Q(last_name__icontains=query)
-            ).filter(is_active=True)[:limit]
+            ).filter(is_active=True).values(
+                'id', 'username', 'first_name', 'last_name', 'photo_profil'
+            )[:limit]
+            avatar_storage = User._meta.get_field('photo_profil').storage
             
             results['users'] = [
                 {
-                    'id': user.id,
-                    'username': user.username,
-                    'full_name': user.get_full_name(),
-                    'avatar': user.avatar.url if user.avatar else None
+                    'id': user['id'],
+                    'username': user['username'],
+                    'full_name': f"{user['first_name']} {user['last_name']}".strip(),
+                    'avatar': avatar_storage.url(user['photo_profil']) if user['photo_profil'] else None
                 }
                 for user in users
             ]
         
         if search_type in ['all', 'events']:
-            # Recherche d'événements
-            events = Event.objects.filter(
-                Q(titre__icontains=query) |
-                Q(description__icontains=query)
-            ).filter(statut='APPROUVE')[:limit]
+            # Recherche d'événements : plein texte indexé (GIN) sous PostgreSQL
+            if connection.vendor == 'postgresql':
+                event_filter = Q(search_vector=SearchQuery(query, config='french'))
+            else:
+                event_filter = Q(titre__icontains=query) | Q(description__icontains=query)
+            # Image de couverture lue dans la même requête
+            cover_image = EventMedia.objects.filter(
+                evenement=OuterRef('pk'),
+                usage='couverture',
+                type_media='image',
+                est_active=True
+            ).values('fichier')[:1]
+            events = Event.objects.filter(event_filter).filter(statut='APPROUVE').annotate(
+                image=Subquery(cover_image)
+            ).values('id', 'titre', 'description', 'date_debut', 'lieu', 'image')[:limit]
+            media_storage = EventMedia._meta.get_field('fichier').storage
             
             results['events'] = [
                 {
-                    'id': event.id,
-                    'titre': event.titre,
-                    'description': event.description[:100],
-                    'date_debut': event.date_debut,
-                    'lieu': event.lieu,
-                    'image': event.image.url if event.image else None
+                    'id': event['id'],
+                    'titre': event['titre'],
+                    'description': event['description'][:100],
+                    'date_debut': event['date_debut'],
+                    'lieu': event['lieu'],
+                    'image': media_storage.url(event['image']) if event['image'] else None
                 }
                 for event in events
             ]
@@ -365,7 +366,10 @@ class ContactMessageListView(generics.ListCreateAPIView):
     POST /api/core/contact/
     """
     
-    queryset = ContactMessage.objects.all().order_by('-date_creation')
+    # Seules les colonnes exposées par ContactMessageSerializer sont lues
+    queryset = ContactMessage.objects.only(
+        *ContactMessageSerializer.Meta.fields
+    ).order_by('-date_creation')
     
     def get_serializer_class(self):
         """Retourne le sérialiseur approprié selon la méthode."""
@@ -383,17 +387,9 @@ class ContactMessageListView(generics.ListCreateAPIView):
         """Traite la création d'un message de contact."""
         message = serializer.save()
         
-        # Envoyer une notification par email aux administrateurs
-        try:
-            send_mail(
-                subject=f'Nouveau message de contact: {message.sujet}',
-                message=f'De: {message.nom} ({message.email})\n\n{message.message}',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.ADMIN_EMAIL],
-                fail_silently=True
-            )
-        except Exception as e:
-            logger.error(f'Contact email error: {e}')
+        # Notification des administrateurs par email (tâche asynchrone, après validation de la transaction) ;
+        # un broker indisponible est journalisé, le message reste enregistré
+        transaction.on_commit(lambda: enqueue_task(send_contact_email, message.pk))
 
 
 class FAQListView(generics.ListAPIView):
@@ -409,6 +405,36 @@ class FAQListView(generics.ListAPIView):
     def get_queryset(self):
         """Retourne les FAQ actives triées par ordre."""
         return FAQ.objects.filter(actif=True).order_by('ordre', 'question')
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Liste les FAQ depuis le cache ; seule la pagination est calculée par requête.
+
+        L'empreinte de la liste est calculée une fois, avec la mise en cache :
+        l'ETag en dérive (avec l'URL, qui porte la pagination) et une requête
+        conditionnelle à jour reçoit un 304 sans corps.
+        """
+        cached = cache_get(FAQ_LIST_CACHE_KEY)
+        if cached is None:
+            data = self.get_serializer(self.get_queryset(), many=True).data
+            digest = hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+            cached = {'data': data, 'digest': digest}
+            cache_set(FAQ_LIST_CACHE_KEY, cached, FAQ_LIST_CACHE_TIMEOUT)
+        
+        etag = quote_etag(hashlib.md5(
+            f"{cached['digest']}:{request.build_absolute_uri()}".encode()
+        ).hexdigest())
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        page = self.paginate_queryset(cached['data'])
+        if page is not None:
+            response = self.get_paginated_response(page)
+        else:
+            response = Response(cached['data'])
+        response['ETag'] = etag
+        return response
 
 
 class AppSettingsView(generics.RetrieveUpdateAPIView):
@@ -10,7 +10,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
-from django.db.models import Count, Sum
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
 from .models import Event, EventCategory, EventParticipation, EventShare, EventTicket
 
 
@@ -109,22 +109,38 @@ class EventAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related(
             'createur', 'categorie', 'validateur'
         ).annotate(
-            participants_count=Count('participations'),
-            revenue=Sum('tickets__prix')
+            participants_count=Count(
+                'participations',
+                filter=Q(participations__statut='PARTICIPE')
+            ),
+            # Sous-requête : une jointure sur les billets multiplierait le comptage
+            revenue=Subquery(
+                EventTicket.objects.filter(evenement=OuterRef('pk'), statut='PAYE')
+                .values('evenement')
+                .annotate(total=Sum('prix'))
+                .values('total')
+            )
         )
     
+    def _get_revenue(self, obj):
+        """Revenu calculé par get_queryset (mêmes règles que Event.get_revenue)."""
+        if not obj.billetterie_activee:
+            return 0
+        return obj.revenue or 0
+    
     def get_participants_count(self, obj):
         """Affiche le nombre de participants."""
-        count = obj.get_participants_count()
+        count = obj.participants_count
         if count > 0:
             url = reverse('admin:events_eventparticipation_changelist') + f'?evenement__id__exact={obj.id}'
             return format_html('<a href="{}">{} participants</a>', url, count)
         return '0 participant'
     get_participants_count.short_description = _('Participants')
+    get_participants_count.admin_order_field = 'participants_count'
     
     def get_revenue(self, obj):
         """Affiche le revenu de l'événement."""
-        revenue = obj.get_revenue()
+        revenue = self._get_revenue(obj)
         if revenue > 0:
             return format_html('{:,.0f} FCFA', revenue)
         return '0 FCFA'
@@ -132,7 +148,7 @@ class EventAdmin(admin.ModelAdmin):
     
     def get_commission_amount(self, obj):
         """Affiche le montant de commission."""
-        commission = obj.get_commission_amount()
+        commission = self._get_revenue(obj) * (obj.commission_billetterie / 100)
         if commission > 0:
             return format_html('{:,.0f} FCFA', commission)
         return '0 FCFA'
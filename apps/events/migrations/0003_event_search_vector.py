@@ -0,0 +1,75 @@
+# Generated by Django 5.2.4 on 2025-08-13 15:45
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+CREATE_TRIGGER_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION events_event_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('french', coalesce(NEW.titre, '')), 'A') ||
+            setweight(to_tsvector('french', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    'DROP TRIGGER IF EXISTS events_event_search_vector_trigger ON "events_event"',
+    """
+    CREATE TRIGGER events_event_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF titre, description ON "events_event"
+    FOR EACH ROW EXECUTE FUNCTION events_event_search_vector_update()
+    """,
+    # Remplissage des événements existants (le trigger calcule la valeur)
+    'UPDATE "events_event" SET titre = titre',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "event_search_gin" ON "events_event" USING gin (search_vector)',
+    # Les index trigrammes de 0002 ne servent plus à la recherche d'événements
+    'DROP INDEX CONCURRENTLY IF EXISTS "events_event_titre_trgm"',
+    'DROP INDEX CONCURRENTLY IF EXISTS "events_event_description_trgm"',
+]
+
+DROP_TRIGGER_SQL = [
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "events_event_titre_trgm" ON "events_event" '
+    'USING gin (UPPER("titre"::text) gin_trgm_ops)',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "events_event_description_trgm" ON "events_event" '
+    'USING gin (UPPER("description"::text) gin_trgm_ops)',
+    'DROP INDEX CONCURRENTLY IF EXISTS "event_search_gin"',
+    'DROP TRIGGER IF EXISTS events_event_search_vector_trigger ON "events_event"',
+    'DROP FUNCTION IF EXISTS events_event_search_vector_update()',
+]
+
+
+def create_search_trigger(apps, schema_editor):
+    """Installe le trigger et l'index GIN de recherche plein texte, retire les index trigrammes (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in CREATE_TRIGGER_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_trigger(apps, schema_editor):
+    """Supprime le trigger et l'index GIN de recherche plein texte, recrée les index trigrammes (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_TRIGGER_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction.
+    atomic = False
+
+    dependencies = [
+        ('events', '0002_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
@@ -10,6 +10,7 @@ Ce module définit tous les modèles liés aux événements :
 """
 
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
@@ -686,6 +687,13 @@ class Event(models.Model):
         help_text="Commission en pourcentage sur les ventes"
     )
     
+    # Recherche plein texte (titre pondéré A, description B), tenue à jour
+    # par un trigger PostgreSQL et indexée en GIN (migration 0003)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False
+    )
+    
     class Meta:
         verbose_name = _('Événement')
         verbose_name_plural = _('Événements')
@@ -7,7 +7,7 @@ la gestion des événements et des interactions associées.
 
 import csv
 from datetime import datetime, timedelta
-from django.http import Http404, HttpResponse
+from django.http import Http404, StreamingHttpResponse
 from rest_framework import generics, status, permissions, filters
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -1069,6 +1069,13 @@ def reject_event(request, event_id):
     }, status=status.HTTP_200_OK)
 
 
+class EchoBuffer:
+    """Pseudo-fichier pour csv.writer : retourne la ligne écrite au lieu de la stocker."""
+    
+    def write(self, value):
+        return value
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def export_participants(request, event_id):
@@ -1079,40 +1086,46 @@ def export_participants(request, event_id):
     """
     
     try:
-        event = Event.objects.get(id=event_id)
+        event = Event.objects.only('id', 'createur_id').get(id=event_id)
     except Event.DoesNotExist:
         return Response({
             'error': 'Événement introuvable'
         }, status=status.HTTP_404_NOT_FOUND)
     
     # Vérifier les permissions
-    if event.createur != request.user and not request.user.is_staff:
+    if event.createur_id != request.user.id and not request.user.is_staff:
         return Response({
             'error': 'Permission refusée'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    # Créer la réponse CSV
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="participants_{event.id}.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['Nom', 'Email', 'Téléphone', 'Statut', 'Date de participation'])
-    
-    # Exporter les participants
+    # Participants lus par blocs : la mémoire ne dépend pas de leur nombre
     participants = EventParticipation.objects.filter(
         evenement=event
-    ).select_related('utilisateur')
-    
-    for participation in participants:
-        user = participation.utilisateur
-        writer.writerow([
-            user.get_full_name() or user.username,
-            user.email,
-            getattr(user, 'telephone', ''),
-            participation.get_statut_display(),
-            participation.date_participation.strftime('%d/%m/%Y %H:%M')
-        ])
-    
+    ).select_related('utilisateur').only(
+        'statut', 'date_participation',
+        'utilisateur__username', 'utilisateur__first_name', 'utilisateur__last_name',
+        'utilisateur__email', 'utilisateur__telephone'
+    ).iterator(chunk_size=2000)
+    
+    def rows():
+        yield ['Nom', 'Email', 'Téléphone', 'Statut', 'Date de participation']
+        for participation in participants:
+            user = participation.utilisateur
+            yield [
+                user.get_full_name() or user.username,
+                user.email,
+                getattr(user, 'telephone', ''),
+                participation.get_statut_display(),
+                participation.date_participation.strftime('%d/%m/%Y %H:%M')
+            ]
+    
+    # Réponse CSV envoyée au fil de l'écriture
+    writer = csv.writer(EchoBuffer())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in rows()),
+        content_type='text/csv'
+    )
+    response['Content-Disposition'] = f'attachment; filename="participants_{event.id}.csv"'
     return response
 
 
@@ -11,6 +11,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from apps.authentication.authentication import invalidate_user_tokens
 from .models import User, UserVerification, Follow
 
 
@@ -124,7 +125,9 @@ class UserAdmin(BaseUserAdmin):
     
     def activate_users(self, request, queryset):
         """Action pour activer des utilisateurs."""
-        updated = queryset.update(is_active=True)
+        user_ids = list(queryset.values_list('pk', flat=True))
+        updated = User.objects.filter(pk__in=user_ids).update(is_active=True)
+        invalidate_user_tokens(*user_ids)
         self.message_user(
             request,
             f'{updated} utilisateur(s) activé(s) avec succès.'
@@ -133,7 +136,9 @@ class UserAdmin(BaseUserAdmin):
     
     def deactivate_users(self, request, queryset):
         """Action pour désactiver des utilisateurs."""
-        updated = queryset.update(is_active=False)
+        user_ids = list(queryset.values_list('pk', flat=True))
+        updated = User.objects.filter(pk__in=user_ids).update(is_active=False)
+        invalidate_user_tokens(*user_ids)
         self.message_user(
             request,
             f'{updated} utilisateur(s) désactivé(s) avec succès.'
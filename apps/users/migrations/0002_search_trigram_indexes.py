@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2025-08-13 15:30
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# (nom de l'index, colonne) des index trigrammes servant la recherche globale.
+# __icontains est traduit par UPPER("colonne"::text) LIKE UPPER(...) : l'index
+# porte sur la même expression pour être utilisable par le planificateur.
+TRIGRAM_INDEXES = [
+    ('users_user_username_trgm', 'username'),
+    ('users_user_first_name_trgm', 'first_name'),
+    ('users_user_last_name_trgm', 'last_name'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Crée les index GIN trigrammes sans verrouiller la table (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "users_user" '
+            f'USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    """Supprime les index GIN trigrammes (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction.
+    atomic = False
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -212,11 +212,17 @@ class UserPublicSerializer(serializers.ModelSerializer):
         ]
     
     def get_followers_count(self, obj):
-        """Retourne le nombre de followers."""
+        """Retourne le nombre de followers (annotation de la vue si présente)."""
+        count = getattr(obj, 'followers_count', None)
+        if count is not None:
+            return count
         return obj.get_followers_count()
     
     def get_events_count(self, obj):
-        """Retourne le nombre d'événements créés."""
+        """Retourne le nombre d'événements créés (annotation de la vue si présente)."""
+        count = getattr(obj, 'events_count', None)
+        if count is not None:
+            return count
         return obj.get_events_count()
 
 
@@ -12,7 +12,11 @@ from rest_framework.authtoken.models import Token
 from rest_framework.pagination import PageNumberPagination
 from django.contrib.auth import login, logout
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from apps.authentication.models import LoginAttempt
+from apps.events.models import Event
 from .models import User, UserVerification, Follow
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer,
@@ -21,6 +25,33 @@ from .serializers import (
 )
 
 
+def _count_subquery(queryset, field):
+    """Sous-requête corrélée comptant les lignes de `queryset` liées à l'utilisateur par `field`."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0
+    )
+
+
+def with_public_counts(queryset):
+    """
+    Annote les compteurs lus par UserPublicSerializer (évite deux COUNT par utilisateur).
+
+    Une sous-requête par relation : joindre abonnés et événements dans la
+    même requête multiplierait les lignes avant le comptage.
+    """
+    return queryset.annotate(
+        followers_count=_count_subquery(Follow.objects.all(), 'following'),
+        events_count=_count_subquery(Event.objects.all(), 'createur')
+    )
+
+
 class UserPagination(PageNumberPagination):
     """Pagination personnalisée pour les utilisateurs."""
     page_size = 20
@@ -103,6 +134,16 @@ def logout_view(request):
     except:
         pass
     
+    # Durée de la session ouverte par la dernière connexion réussie
+    last_login = (
+        LoginAttempt.objects.filter(utilisateur=request.user, statut="REUSSI")
+        .order_by('-date_tentative')
+        .values_list('pk', 'date_tentative', 'duree_session')
+        .first()
+    )
+    if last_login and last_login[2] is None:
+        LoginAttempt.set_session_duration(last_login[0], timezone.now() - last_login[1])
+    
     # Déconnecter l'utilisateur
     logout(request)
     
@@ -137,7 +178,7 @@ class UserDetailView(generics.RetrieveAPIView):
     
     serializer_class = UserPublicSerializer
     permission_classes = [permissions.AllowAny]
-    queryset = User.objects.filter(is_active=True)
+    queryset = with_public_counts(User.objects.filter(is_active=True))
 
 
 class UserListView(generics.ListAPIView):
@@ -169,7 +210,7 @@ class UserListView(generics.ListAPIView):
         if verified == 'true':
             queryset = queryset.filter(est_verifie=True)
         
-        return queryset.order_by('-date_creation')
+        return with_public_counts(queryset).order_by('-date_creation')
 
 
 class UserVerificationView(generics.CreateAPIView):
@@ -0,0 +1,16 @@
+"""
+Configuration Celery pour spotvibe_backend.
+
+Les paramètres sont lus depuis les settings Django (préfixe CELERY_) et
+les tâches sont découvertes dans les modules tasks.py des applications.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spotvibe_backend.settings')
+
+app = Celery('spotvibe_backend')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -35,6 +35,7 @@ INSTALLED_APPS = [
     
     # Applications tierces
     'rest_framework',
+    'rest_framework.authtoken',
     'rest_framework_simplejwt',
     'corsheaders',
     'oauth2_provider',
@@ -97,6 +98,11 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default=''),
         'PORT': config('DB_PORT', default=''),
+        # Connexions persistantes : évite une nouvelle connexion par requête
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        # À activer derrière PgBouncer en mode transaction (curseurs serveur non supportés)
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool),
     }
 }
 
@@ -143,6 +149,7 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+        'apps.authentication.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -161,6 +168,16 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # Limites par vue (ScopedRateThrottle), compteurs stockés dans le cache par défaut
+    'DEFAULT_THROTTLE_RATES': {
+        'google_auth': '20/min',
+        'facebook_auth': '20/min',
+        'password_reset': '5/hour',
+        'password_reset_confirm': '10/hour',
+        'password_reset_email': '3/hour',
+        'two_factor_setup': '5/hour',
+        'two_factor_verify': '6/min',
+    },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
@@ -234,6 +251,40 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Tâches d'E/S (emails, SMS) : un message à la fois par processus
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Tâches périodiques (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    'refresh-app-statistics': {
+        'task': 'apps.core.tasks.refresh_app_statistics',
+        'schedule': 30.0,
+    },
+}
+
+# Configuration du cache : Redis si REDIS_CACHE_URL est défini (production),
+# cache mémoire local sinon (développement, tests)
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default='')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'spotvibe',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Géolocalisation des IP (base MaxMind GeoLite2 City, vide pour désactiver)
+GEOIP_CITY_DATABASE = config('GEOIP_CITY_DATABASE', default='')
+
+# Sessions servies depuis le cache, la base ne sert que de persistance
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 
 # Configuration email
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')